@@ -1,19 +1,230 @@
 # 12_context_manager.py — Context manager con __enter__/__exit__
+# Temporizador mide un bloque; Perfilador agrupa tramos con nombre (anidados),
+# con forma de decorador y estadísticas por tramo. No imprime nada salvo que se le pida.
+# Desde otro módulo (el nombre empieza con dígito):
+#   perfil = importlib.import_module("12_context_manager").Perfilador()
+
+import threading
+from array import array
+from functools import wraps
+from time import perf_counter_ns
+
+BUCKETS = 64  # histograma en potencias de 2 de nanosegundos: bucket k ~ [2^(k-1), 2^k) ns
+
 
 class Temporizador:
-    import time
+    def __init__(self, mostrar: bool = False):
+        self.mostrar = mostrar
+        self.dt = 0.0
     def __enter__(self):
-        from time import perf_counter
-        self.t0 = perf_counter()
+        self.t0 = perf_counter_ns()
         return self
     def __exit__(self, exc_type, exc, tb):
-        from time import perf_counter
-        self.dt = perf_counter() - self.t0
-        print(f"Bloque tomó {self.dt:.6f} s")
+        self.dt = (perf_counter_ns() - self.t0) / 1e9
+        if self.mostrar:
+            print(f"Bloque tomó {self.dt:.6f} s")
         # devolver False para propagar excepciones si ocurrieron
         return False
 
+
+# Contadores de un tramo en un hilo: un solo array("q") preasignado.
+COUNT, TOTAL, MIN, MAX, HIST = 0, 1, 2, 3, 4
+
+
+class _EstadoHilo:
+    """Lo que un hilo toca al entrar/salir de tramos: sus pilas y sus contadores por tramo."""
+    __slots__ = ("pila", "inicios", "contadores")
+
+    def __init__(self, raiz):
+        self.pila = [raiz]
+        self.inicios = [0]
+        self.contadores = {}   # Tramo -> array("q"): COUNT, TOTAL, MIN, MAX y el histograma desde HIST
+
+
+class Tramo:
+    """Nodo del árbol de tramos: count/total/min/max e histograma de sus ejecuciones (sumados entre hilos)."""
+    __slots__ = ("nombre", "padre", "hijos", "perfilador")
+
+    def __init__(self, nombre, padre, perfilador):
+        self.nombre = nombre
+        self.padre = padre
+        self.hijos = {}
+        self.perfilador = perfilador
+
+    # El tramo es su propio context manager: entrar/salir no crea objetos nuevos.
+    # Cada hilo tiene sus pilas y sus contadores (ver _EstadoHilo): en régimen no hay
+    # lock ni asignaciones, y hilos que miden el mismo tramo no compiten entre sí.
+    def __enter__(self):
+        estado = self.perfilador._estado()
+        estado.pila.append(self)
+        estado.inicios.append(perf_counter_ns())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        fin = perf_counter_ns()
+        estado = self.perfilador._local.estado
+        dt = fin - estado.inicios.pop()
+        estado.pila.pop()
+        c = estado.contadores.get(self)
+        if c is None:   # primera vez de este tramo en este hilo
+            c = estado.contadores[self] = array("q", bytes(8 * (HIST + BUCKETS)))
+        if c[COUNT] == 0 or dt < c[MIN]:
+            c[MIN] = dt
+        if dt > c[MAX]:
+            c[MAX] = dt
+        c[COUNT] += 1
+        c[TOTAL] += dt
+        c[HIST + min(dt.bit_length(), BUCKETS - 1)] += 1
+        return False
+
+    def _por_hilo(self):
+        return [c for c in (e.contadores.get(self) for e in list(self.perfilador._estados))
+                if c is not None and c[COUNT]]
+
+    @property
+    def count(self):
+        return sum(c[COUNT] for c in self._por_hilo())
+
+    @property
+    def total_ns(self):
+        return sum(c[TOTAL] for c in self._por_hilo())
+
+    @property
+    def min_ns(self):
+        return min((c[MIN] for c in self._por_hilo()), default=0)
+
+    @property
+    def max_ns(self):
+        return max((c[MAX] for c in self._por_hilo()), default=0)
+
+    @property
+    def histograma(self):
+        total = array("q", bytes(8 * BUCKETS))
+        for c in self._por_hilo():
+            for k in range(BUCKETS):
+                total[k] += c[HIST + k]
+        return total
+
+    def ruta(self):
+        partes, nodo = [], self
+        while nodo.padre is not None:
+            partes.append(nodo.nombre)
+            nodo = nodo.padre
+        return "/".join(reversed(partes))
+
+
+class Perfilador:
+    """
+    Perfilador jerárquico de bajo costo:
+      with perfil.tramo("armar"):          # tramos anidados por nombre
+          with perfil.tramo("interes"): ...
+      @perfil.perfilar("resumen")          # forma decorador
+    Los tramos se crean una sola vez por ruta; en régimen, entrar y salir de un
+    tramo sólo actualiza contadores preasignados.
+    Se puede usar desde varios hilos: cada hilo tiene su propia pila de tramos
+    abiertos (un tramo se anida bajo el que abrió el mismo hilo) y sus propios
+    contadores, sin lock al medir; las estadísticas de una ruta suman todos los hilos.
+
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> perfil = Perfilador()
+    >>> def trabajo(_):
+    ...     for _ in range(500):
+    ...         with perfil.tramo("lote"):
+    ...             with perfil.tramo("paso"):
+    ...                 pass
+    >>> with ThreadPoolExecutor(max_workers=4) as pool:
+    ...     _ = list(pool.map(trabajo, range(8)))
+    >>> stats = perfil.estadisticas()
+    >>> sorted(stats), stats["lote"]["count"], stats["lote/paso"]["count"]
+    (['lote', 'lote/paso'], 4000, 4000)
+    >>> sum(stats["lote/paso"]["histograma"].values())
+    4000
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()   # sólo para crear nodos y registrar hilos nuevos
+        self.reiniciar()
+
+    def _estado(self):
+        """Estado (pilas y contadores) del hilo actual; se crea y registra la primera vez."""
+        try:
+            return self._local.estado
+        except AttributeError:
+            estado = self._local.estado = _EstadoHilo(self.raiz)
+            with self._lock:
+                self._estados.append(estado)
+            return estado
+
+    def tramo(self, nombre):
+        actual = self._estado().pila[-1]
+        nodo = actual.hijos.get(nombre)
+        if nodo is None:
+            with self._lock:
+                nodo = actual.hijos.get(nombre)
+                if nodo is None:
+                    nodo = actual.hijos[nombre] = Tramo(nombre, actual, self)
+        return nodo
+
+    def perfilar(self, nombre=None):
+        """Decorador: mide cada llamada como un tramo (por defecto, con el nombre de la función)."""
+        def decorar(fn):
+            etiqueta = nombre or fn.__qualname__
+
+            @wraps(fn)
+            def medido(*args, **kwargs):
+                with self.tramo(etiqueta):
+                    return fn(*args, **kwargs)
+            return medido
+        return decorar
+
+    def reiniciar(self):
+        self.raiz = Tramo("", None, self)
+        self._local = threading.local()
+        self._estados = []   # un _EstadoHilo por hilo que midió algo (sobreviven al hilo)
+
+    def _recorrer(self, nodo=None, nivel=0):
+        nodo = nodo or self.raiz
+        for hijo in list(nodo.hijos.values()):
+            yield hijo, nivel
+            yield from self._recorrer(hijo, nivel + 1)
+
+    def estadisticas(self):
+        """Dict por ruta ("a/b"): count, total_ns, min_ns, max_ns, histograma (bucket -> cantidad)."""
+        return {
+            t.ruta(): {
+                "count": t.count,
+                "total_ns": t.total_ns,
+                "min_ns": t.min_ns,
+                "max_ns": t.max_ns,
+                "histograma": {k: c for k, c in enumerate(t.histograma) if c},
+            }
+            for t, _ in self._recorrer()
+        }
+
+    def reporte(self):
+        """Árbol de tramos como texto (no imprime: lo devuelve)."""
+        lineas = [f"{'tramo':<40} {'n':>8} {'total ms':>10} {'medio µs':>10} {'min µs':>9} {'max µs':>9}"]
+        for t, nivel in self._recorrer():
+            medio = t.total_ns / t.count if t.count else 0
+            lineas.append(f"{'  ' * nivel + t.nombre:<40} {t.count:>8} {t.total_ns / 1e6:>10.3f} "
+                          f"{medio / 1e3:>10.2f} {t.min_ns / 1e3:>9.2f} {t.max_ns / 1e3:>9.2f}")
+        return "\n".join(lineas)
+
+
 if __name__ == "__main__":
-    with Temporizador() as t:
+    with Temporizador(mostrar=True) as t:
         s = sum(range(2_000_00))
     print(f"Medido: {t.dt:.6f} s")
+
+    perfil = Perfilador()
+
+    @perfil.perfilar("cuadrados")
+    def cuadrados(n):
+        return [x * x for x in range(n)]
+
+    for _ in range(100):
+        with perfil.tramo("lote"):
+            with perfil.tramo("suma"):
+                sum(range(10_000))
+            cuadrados(1_000)
+    print(perfil.reporte())
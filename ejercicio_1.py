@@ -4,16 +4,29 @@
 #Factory (creación de créditos según el tipo pedido).
 
 from __future__ import annotations
+import unicodedata
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Dict
+from itertools import accumulate, repeat
+from math import ceil, exp, expm1, log1p
+from operator import add, mul, sub
+from threading import Lock
+from typing import Callable, Hashable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Sequence, Tuple, Union
 
 
 # ==============================
 # 1) Cuenta bancaria con property
 # ==============================
 class BankAccount:
-    """Cuenta bancaria simple con balance protegido, depósito y extracción."""
+    """
+    Cuenta bancaria simple con balance protegido, depósito y extracción.
+    version aumenta con cada cambio de balance: los Loan la comparan para
+    saber si su último resumen sigue valiendo. Quien escriba _balance por
+    fuera de los métodos (Ledger, AccountStore) debe incrementar _version.
+    """
+    _version = 0
 
     def __init__(self, owner: str, balance: float = 0.0) -> None:
         self._owner = owner
@@ -24,6 +37,10 @@ class BankAccount:
     def owner(self) -> str:
         return self._owner
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     @property
     def balance(self) -> float:
         """Balance disponible. No puede ser negativo."""
@@ -34,12 +51,14 @@ class BankAccount:
         if value < 0:
             raise ValueError("El balance no puede ser negativo.")
         self._balance = float(value)
+        self._version += 1
 
     def deposit(self, amount: float) -> None:
         try:
             if amount <= 0:
                 raise ValueError("El depósito debe ser > 0.")
             self._balance += float(amount)
+            self._version += 1
         except ValueError as e:
             print(e)
 
@@ -50,6 +69,7 @@ class BankAccount:
             if amount > self._balance:
                 raise ValueError("Fondos insuficientes.")
             self._balance -= float(amount)
+            self._version += 1
         except ValueError as e:
             print(e)
 
@@ -60,21 +80,297 @@ class BankAccount:
 # ======================================================
 # 2) Strategy pattern: estrategias de amortización (ABC)
 # ======================================================
+# Plazo máximo que consideran los solvers inversos (30 años en cuotas mensuales).
+MAX_PERIODS = 360
+
+# Hasta este plazo el cronograma alemán se arma con un bucle simple (más rápido en plazos cortos).
+SHORT_TERM = 120
+
+# Orden de las columnas del cronograma (modo columnar y ScheduleRow).
+COLUMNS = ("period", "payment", "interest", "amortization", "remaining")
+
+# Modo columnar: un array contiguo por columna ("q" para period, "d" para el resto).
+Columns = Dict[str, array]
+
+
+class ScheduleRow(NamedTuple):
+    """
+    Fila compacta del cronograma (tupla inmutable, sin dict por fila).
+    Se lee igual que antes: row["payment"], o como atributo: row.payment.
+    Las claves se comportan como las del dict de antes:
+
+    >>> row = ScheduleRow(1, 100.0, 30.0, 70.0, 930.0)
+    >>> row["payment"], "payment" in row, "count" in row
+    (100.0, True, False)
+    >>> row["count"]
+    Traceback (most recent call last):
+    ...
+    KeyError: 'count'
+    """
+    period: int
+    payment: float
+    interest: float
+    amortization: float
+    remaining: float
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        # Como en un dict: pregunta por la columna, no por el valor.
+        return key in self._fields
+
+    def keys(self) -> Tuple[str, ...]:
+        # Permite dict(row) como con las filas dict de antes.
+        return COLUMNS
+
+
+class Schedule:
+    """
+    Cronograma respaldado por columnas array('q')/array('d') (~40 bytes por período).
+    Soporta len, indexado (devuelve una fila row_type), slicing (devuelve otro Schedule)
+    e iteración. Es de sólo lectura, así que se puede compartir (caché).
+    row_type es la tupla de cada fila (ScheduleRow; la fachada en castellano usa la suya),
+    con los campos en el orden de COLUMNS.
+    """
+    __slots__ = ("_cols", "_row")
+
+    def __init__(self, columns: Columns, row_type: type = ScheduleRow) -> None:
+        self._cols = cols = {c: columns[c] for c in COLUMNS}
+        n = len(cols["period"])
+        for col in cols.values():
+            if len(col) != n:
+                raise ValueError("Todas las columnas del cronograma deben tener el mismo largo.")
+        self._row = row_type
+
+    def __len__(self) -> int:
+        return len(self._cols["period"])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ScheduleRow, "Schedule"]:
+        if isinstance(index, slice):
+            return Schedule({c: col[index] for c, col in self._cols.items()}, self._row)
+        return self._row(*(col[index] for col in self._cols.values()))
+
+    def __iter__(self) -> Iterator[ScheduleRow]:
+        return map(self._row, *self._cols.values())
+
+    def column(self, name: str) -> memoryview:
+        """Vista de sólo lectura (sin copia) de una columna."""
+        return memoryview(self._cols[name]).toreadonly()
+
+    def to_dicts(self) -> List[Dict]:
+        """Formato anterior: lista de dicts."""
+        return [row._asdict() for row in self]
+
+    def __repr__(self) -> str:
+        return f"Schedule(periods={len(self)})"
+
+
 class RepaymentStrategy(ABC):
-    """Estrategia de amortización: arma el cronograma de pagos."""
+    """
+    Estrategia de amortización: arma el cronograma de pagos.
+    Cada subclase implementa build_columns (modo columnar) o build_schedule
+    (contrato anterior); sin ninguno de los dos la clase no se puede definir.
+    """
     name: str
 
-    @abstractmethod
-    def build_schedule(self, principal: float, interest_rate: float, periods: int) -> List[Dict]:
-        # """
-        # Devuelve una lista de dicts con:
-        # period, payment, interest, amortization, remaining
-        # """
-        ...   # Aún no implementado
+    def __new__(cls, *args, **kwargs):
+        # La base sola no arma cronogramas (como cuando build_schedule era @abstractmethod).
+        if cls is RepaymentStrategy:
+            raise TypeError("RepaymentStrategy es abstracta: use una estrategia concreta.")
+        return super().__new__(cls)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if (cls.build_columns is RepaymentStrategy.build_columns
+                and cls.build_schedule is RepaymentStrategy.build_schedule):
+            raise TypeError(f"{cls.__name__} debe implementar build_columns o build_schedule.")
+
+    def build_columns(self, principal: float, interest_rate: float, periods: int) -> Columns:
+        """
+        Cronograma en modo columnar: dict con un array por columna
+        (period, payment, interest, amortization, remaining). Las estrategias
+        concretas lo calculan con fórmulas cerradas; esta versión base lo arma
+        desde build_schedule, así siguen andando las estrategias que sólo
+        implementan el contrato anterior (filas dict o ScheduleRow).
+        """
+        rows = self.build_schedule(principal, interest_rate, periods)
+        return {c: array("q" if c == "period" else "d", [row[c] for row in rows]) for c in COLUMNS}
+
+    def build_schedule(self, principal: float, interest_rate: float, periods: int) -> Schedule:
+        """
+        Devuelve el cronograma (Schedule) con filas:
+        period, payment, interest, amortization, remaining
+        (vista de filas sobre build_columns).
+        """
+        return Schedule(self.build_columns(principal, interest_rate, periods))
+
+    def iter_schedule(self, principal: float, interest_rate: float, periods: int) -> Iterator[ScheduleRow]:
+        """
+        Generador de filas (mismas columnas que build_schedule). Las estrategias
+        concretas las calculan de a una, en memoria constante.
+        """
+        yield from self.build_schedule(principal, interest_rate, periods)
+
+    def totals(self, principal: float, interest_rate: float, periods: int) -> Tuple[float, float]:
+        """
+        (total_paid, total_interest) sin armar filas. Las estrategias concretas
+        lo resuelven en O(1) con fórmula cerrada; esta versión base suma columnas.
+        """
+        cols = self.build_columns(principal, interest_rate, periods)
+        return sum(cols["payment"]), sum(cols["interest"])
+
+    def build_columns_cents(self, principal_cents: int, interest_rate: float, periods: int) -> Columns:
+        """
+        Motor de punto fijo: mismas columnas que build_columns pero en centavos
+        enteros (array("q")). Interés redondeado por período con round_cents y
+        amortización como diferencia de saldos redondeados: la suma de
+        amortizaciones es exactamente el capital y el saldo final es exactamente 0.
+        Versión base: redondea a centavos los saldos de build_columns.
+        """
+        remaining = self.build_columns(principal_cents / 100, interest_rate, periods)["remaining"]
+        balance = array("q", [principal_cents])
+        balance.extend(to_cents(s) for s in remaining[:-1])
+        balance.append(0)
+        return _cents_from_balances(balance, interest_rate, periods)
+
+    # --- Solver inverso: capacidad de pago ---
+    def max_principal_for_payment(self, max_payment: float, interest_rate: float, periods: int) -> float:
+        """
+        Mayor capital cuya cuota más alta no supera max_payment. Las cuotas son
+        lineales en el capital: alcanza con escalar la cuota máxima de P = 1.
+        Las estrategias concretas usan su fórmula cerrada.
+        """
+        return max_payment / max(self.build_columns(1.0, interest_rate, periods)["payment"])
+
+    def min_periods_for_payment(self, principal: float, max_payment: float, interest_rate: float,
+                                max_periods: int = MAX_PERIODS) -> Optional[int]:
+        """
+        Menor plazo (<= max_periods) cuya cuota más alta no supera max_payment,
+        o None si no hay ninguno. Versión base: bisección sobre el plazo.
+        """
+        def fits(n: int) -> bool:
+            return principal * max(self.build_columns(1.0, interest_rate, n)["payment"]) <= max_payment
+
+        if not fits(max_periods):
+            return None
+        lo, hi = 1, max_periods
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if fits(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def max_principal_for_payments(self, max_payments: Sequence[float], interest_rates: Sequence[float],
+                                   periods: Sequence[int]) -> array:
+        """max_principal_for_payment por lotes (un cliente por posición)."""
+        solve = self.max_principal_for_payment
+        return array("d", [solve(x, i, n) for x, i, n in zip(max_payments, interest_rates, periods)])
+
+    def min_periods_for_payments(self, principals: Sequence[float], max_payments: Sequence[float],
+                                 interest_rates: Sequence[float], max_periods: int = MAX_PERIODS) -> array:
+        """min_periods_for_payment por lotes; 0 marca a los clientes sin plazo posible."""
+        solve = self.min_periods_for_payment
+        return array("q", [solve(p, x, i, max_periods) or 0
+                           for p, x, i in zip(principals, max_payments, interest_rates)])
+
+    # --- Tramos con tasa variable (prepagos / cambios de tasa) ---
+    def build_tail(self, opening_balance: float, interest_rates: Sequence[float], first_period: int = 1) -> Columns:
+        """
+        Tramo del cronograma desde first_period con saldo inicial opening_balance
+        y una tasa por período restante (len(interest_rates) períodos). Cuando la
+        tasa cambia se recalcula la cuota con el saldo y el plazo que quedan.
+        Versión base: build_columns por cada tramo de tasa constante.
+        """
+        m = len(interest_rates)
+        cols = {c: array("q" if c == "period" else "d") for c in COLUMNS}
+        balance, j = opening_balance, 0
+        while j < m:
+            rate, end = interest_rates[j], j + 1
+            while end < m and interest_rates[end] == rate:
+                end += 1
+            part = self.build_columns(balance, rate, m - j)
+            for c in COLUMNS:
+                cols[c].extend(part[c][:end - j])
+            balance = part["remaining"][end - j - 1]
+            j = end
+        cols["period"] = array("q", range(first_period, first_period + m))
+        return cols
+
 
 # Esto NO da error
 
 
+# Política de redondeo del motor en centavos: mitad al par (round() de Python).
+def round_cents(value: float) -> int:
+    return round(value)
+
+
+def to_cents(amount: float) -> int:
+    """Pesos -> centavos enteros, con la misma política de redondeo."""
+    return round_cents(amount * 100)
+
+
+def _annuity_factor(log_g: float, periods: int) -> float:
+    """1 - (1+i)^-n con log_g = log1p(i): se satura en 1 para n grande en vez de desbordar."""
+    return -expm1(-periods * log_g)
+
+
+_PERIOD_COLUMNS: Dict[int, array] = {}
+
+
+def _periods_column(periods: int) -> array:
+    # Se arma una vez por plazo y se devuelve una copia (memcpy), no un array compartido.
+    column = _PERIOD_COLUMNS.get(periods)
+    if column is None:
+        column = array("q", range(1, periods + 1))
+        if periods <= MAX_PERIODS:
+            _PERIOD_COLUMNS[periods] = column
+    return column[:]
+
+
+def _cents_from_balances(balance: array, interest_rate: float, periods: int) -> Columns:
+    """
+    Columnas en centavos a partir de los saldos redondeados (balance[0] = capital,
+    balance[n] = 0): la amortización es la diferencia entre saldos, así suma
+    exactamente el capital y cada cuota queda a +-1 centavo de la fórmula exacta.
+    """
+    interest = array("q", [round_cents(b * interest_rate) for b in balance[:-1]])
+    amortization = array("q", [a - b for a, b in zip(balance, balance[1:])])
+    return {
+        "period": _periods_column(periods),
+        "payment": array("q", [x + a for x, a in zip(interest, amortization)]),
+        "interest": interest,
+        "amortization": amortization,
+        "remaining": balance[1:],
+    }
+
+
+def _linear_cents(principal_cents: int, interest_rate: float, periods: int) -> Columns:
+    """
+    Amortización constante en centavos: saldos P*(n-k)/n redondeados, de modo que
+    el resto de la división se reparte entre las cuotas (ninguna se aparta más de
+    un centavo de P/n) en vez de cargarse entero en la última.
+
+    >>> cols = _linear_cents(478_230_860, 0.01, 1200)
+    >>> sum(cols["amortization"]) == 478_230_860, cols["remaining"][-1]
+    (True, 0)
+    >>> exact = 478_230_860 / 1200
+    >>> max(abs(a - exact) for a in cols["amortization"]) <= 1
+    True
+    >>> all(p == x + a for p, x, a in zip(cols["payment"], cols["interest"], cols["amortization"]))
+    True
+    """
+    balance = array("q", [round_cents(principal_cents * (periods - k) / periods) for k in range(periods + 1)])
+    return _cents_from_balances(balance, interest_rate, periods)
+
+
 class GermanStrategy(RepaymentStrategy):
     """
     Crédito Alemán: amortización de capital constante (P/n).
@@ -82,22 +378,91 @@ class GermanStrategy(RepaymentStrategy):
     """
     name = "aleman"
 
-    def build_schedule(self, principal: float, interest_rate: float, periods: int) -> List[Dict]:
-        schedule = []
-        remaining = principal
+    def build_columns(self, principal: float, interest_rate: float, periods: int) -> Columns:
         amort = principal / periods
+        if periods <= SHORT_TERM:
+            return self._short_columns(principal, interest_rate, periods, amort)
+        # saldo al inicio de cada período (accumulate recorre en C, sin bucle Python)
+        opening = list(accumulate(repeat(amort, periods - 1), sub, initial=principal))
+        interest = list(map(mul, opening, repeat(interest_rate)))
+        remaining = array("d", opening[1:])
+        remaining.append(0.0)
+        return {
+            "period": _periods_column(periods),
+            "payment": array("d", list(map(add, interest, repeat(amort)))),
+            "interest": array("d", interest),
+            "amortization": array("d", [amort]) * periods,
+            "remaining": remaining,
+        }
+
+    @staticmethod
+    def _short_columns(principal: float, interest_rate: float, periods: int, amort: float) -> Columns:
+        # Plazos cortos (los 12/24/36 meses que más se cotizan): una sola pasada en Python
+        # cuesta menos que armar las listas intermedias de accumulate/map.
+        payment, interest, remaining = [], [], []
+        opening = principal
         for k in range(1, periods + 1):
-            interest = remaining * interest_rate
-            payment = interest + amort
-            remaining = max(0.0, remaining - amort) #se asegura que el sando "remaining" no sea negativo
-            schedule.append({
-                "period": k,
-                "payment": payment,
-                "interest": interest,
-                "amortization": amort,
-                "remaining": remaining
-            })
-        return schedule
+            x = opening * interest_rate
+            interest.append(x)
+            payment.append(x + amort)
+            opening = principal - k * amort
+            remaining.append(opening)
+        remaining[-1] = 0.0
+        return {
+            "period": _periods_column(periods),
+            "payment": array("d", payment),
+            "interest": array("d", interest),
+            "amortization": array("d", [amort]) * periods,
+            "remaining": array("d", remaining),
+        }
+
+    def iter_schedule(self, principal: float, interest_rate: float, periods: int) -> Iterator[ScheduleRow]:
+        amort = principal / periods
+        for k in range(1, periods + 1):
+            opening = principal - (k - 1) * amort
+            interest = opening * interest_rate
+            yield ScheduleRow(
+                period=k,
+                payment=interest + amort,
+                interest=interest,
+                amortization=amort,
+                remaining=max(0.0, opening - amort),
+            )
+
+    def totals(self, principal: float, interest_rate: float, periods: int) -> Tuple[float, float]:
+        # Serie aritmética: i * (P + ... + P/n) = i * P * (n+1) / 2
+        total_interest = interest_rate * principal * (periods + 1) / 2
+        return principal + total_interest, total_interest
+
+    def max_principal_for_payment(self, max_payment: float, interest_rate: float, periods: int) -> float:
+        # La cuota más alta es la primera: P/n + P*i
+        return max_payment / (1 / periods + interest_rate)
+
+    def min_periods_for_payment(self, principal: float, max_payment: float, interest_rate: float,
+                                max_periods: int = MAX_PERIODS) -> Optional[int]:
+        # P/n + P*i <= X  =>  n >= P / (X - P*i)
+        margin = max_payment - principal * interest_rate
+        if margin <= 0:
+            return None
+        n = max(1, ceil(principal / margin - 1e-9))
+        return n if n <= max_periods else None
+
+    def build_tail(self, opening_balance: float, interest_rates: Sequence[float], first_period: int = 1) -> Columns:
+        # La amortización sigue siendo constante; sólo cambia el interés de cada período.
+        m = len(interest_rates)
+        amort = opening_balance / m
+        opening = [opening_balance - k * amort for k in range(m)]
+        interest = array("d", [s * r for s, r in zip(opening, interest_rates)])
+        return {
+            "period": array("q", range(first_period, first_period + m)),
+            "payment": array("d", [x + amort for x in interest]),
+            "interest": interest,
+            "amortization": array("d", [amort]) * m,
+            "remaining": array("d", [max(0.0, s - amort) for s in opening]),
+        }
+
+    def build_columns_cents(self, principal_cents: int, interest_rate: float, periods: int) -> Columns:
+        return _linear_cents(principal_cents, interest_rate, periods)
 
 
 class AmericanStrategy(RepaymentStrategy):
@@ -107,71 +472,555 @@ class AmericanStrategy(RepaymentStrategy):
     """
     name = "americano"
 
-    def build_schedule(self, principal: float, interest_rate: float, periods: int) -> List[Dict]:
-        schedule = []
+    def build_columns(self, principal: float, interest_rate: float, periods: int) -> Columns:
         interest_payment = principal * interest_rate
         # Períodos 1..(n-1): sólo interés
-        for k in range(1, periods):
-            schedule.append({
-                "period": k,
-                "payment": interest_payment,
-                "interest": interest_payment,
-                "amortization": 0.0,
-                "remaining": principal
-            })
+        payment = array("d", [interest_payment]) * periods
+        amortization = array("d", [0.0]) * periods
+        remaining = array("d", [principal]) * periods
         # Último período: interés + capital
-        final_interest = principal * interest_rate
-        schedule.append({
-            "period": periods,
-            "payment": final_interest + principal,
-            "interest": final_interest,
-            "amortization": principal,
-            "remaining": 0.0
-        })
-        return schedule
+        payment[-1] = interest_payment + principal
+        amortization[-1] = principal
+        remaining[-1] = 0.0
+        return {
+            "period": _periods_column(periods),
+            "payment": payment,
+            "interest": array("d", [interest_payment]) * periods,
+            "amortization": amortization,
+            "remaining": remaining,
+        }
+
+    def iter_schedule(self, principal: float, interest_rate: float, periods: int) -> Iterator[ScheduleRow]:
+        interest_payment = principal * interest_rate
+        for k in range(1, periods):
+            yield ScheduleRow(
+                period=k,
+                payment=interest_payment,
+                interest=interest_payment,
+                amortization=0.0,
+                remaining=principal,
+            )
+        yield ScheduleRow(
+            period=periods,
+            payment=interest_payment + principal,
+            interest=interest_payment,
+            amortization=principal,
+            remaining=0.0,
+        )
+
+    def totals(self, principal: float, interest_rate: float, periods: int) -> Tuple[float, float]:
+        # n * interés + capital
+        total_interest = periods * principal * interest_rate
+        return principal + total_interest, total_interest
+
+    def max_principal_for_payment(self, max_payment: float, interest_rate: float, periods: int) -> float:
+        # La cuota más alta es la última (bullet): P*i + P
+        return max_payment / (1 + interest_rate)
+
+    def min_periods_for_payment(self, principal: float, max_payment: float, interest_rate: float,
+                                max_periods: int = MAX_PERIODS) -> Optional[int]:
+        # El bullet no depende del plazo: o entra con 1 período o no entra nunca.
+        return 1 if principal * (1 + interest_rate) <= max_payment else None
+
+    def build_tail(self, opening_balance: float, interest_rates: Sequence[float], first_period: int = 1) -> Columns:
+        m = len(interest_rates)
+        interest = array("d", [opening_balance * r for r in interest_rates])
+        payment = array("d", interest)
+        amortization = array("d", [0.0]) * m
+        remaining = array("d", [opening_balance]) * m
+        payment[-1] += opening_balance
+        amortization[-1] = opening_balance
+        remaining[-1] = 0.0
+        return {
+            "period": array("q", range(first_period, first_period + m)),
+            "payment": payment,
+            "interest": interest,
+            "amortization": amortization,
+            "remaining": remaining,
+        }
+
+    def build_columns_cents(self, principal_cents: int, interest_rate: float, periods: int) -> Columns:
+        interest_payment = round_cents(principal_cents * interest_rate)
+        payment = array("q", [interest_payment]) * periods
+        amortization = array("q", [0]) * periods
+        remaining = array("q", [principal_cents]) * periods
+        payment[-1] = interest_payment + principal_cents
+        amortization[-1] = principal_cents
+        remaining[-1] = 0
+        return {
+            "period": _periods_column(periods),
+            "payment": payment,
+            "interest": array("q", [interest_payment]) * periods,
+            "amortization": amortization,
+            "remaining": remaining,
+        }
 
 
 class FrenchStrategy(RepaymentStrategy):
     """
     Crédito Francés: cuota constante (sistema de anualidades).
     A = P * i / (1 - (1+i)^-n)
+
+    >>> FrenchStrategy().build_schedule(1_000, 0.03, 12)[0].interest
+    30.0
     """
     name = "frances"
 
-    def build_schedule(self, principal: float, interest_rate: float, periods: int) -> List[Dict]:
-        schedule = []
+    def build_columns(self, principal: float, interest_rate: float, periods: int) -> Columns:
         i = interest_rate
         if i == 0:
             # Sin interés: pagos iguales de capital
             amort = principal / periods
-            remaining = principal
+            return {
+                "period": _periods_column(periods),
+                "payment": array("d", [amort]) * periods,
+                "interest": array("d", [0.0]) * periods,
+                "amortization": array("d", [amort]) * periods,
+                "remaining": array("d", [max(0.0, principal - k * amort) for k in range(1, periods + 1)]),
+            }
+
+        # La amortización crece como (1+i)^k: se arma desde la última, A*v (v = (1+i)^-1),
+        # multiplicando por v hacia atrás. Así los factores sólo se achican (no hay overflow
+        # para n grande) y el saldo tras k pagos es la suma de las amortizaciones que faltan,
+        # sin restas que pierdan precisión; el último saldo es exactamente 0.
+        # accumulate/map recorren las columnas en C, sin un bucle Python por período.
+        log_g = log1p(i)
+        annuity = principal * i / _annuity_factor(log_g, periods)
+        v = exp(-log_g)
+        amortization = list(accumulate(repeat(v, periods - 1), mul, initial=annuity * v))
+        owed = list(accumulate(amortization))     # owed[j]: saldo antes de las últimas j+1 cuotas
+        owed.reverse()
+        amortization.reverse()
+        remaining = array("d", owed[1:])
+        remaining.append(0.0)
+        # Interés sobre el saldo al inicio de cada período (el primero es el capital): P*i exacto.
+        opening = [principal]
+        opening.extend(owed[1:])
+        return {
+            "period": _periods_column(periods),
+            "payment": array("d", [annuity]) * periods,
+            "interest": array("d", list(map(mul, opening, repeat(i, periods)))),
+            "amortization": array("d", amortization),
+            "remaining": remaining,
+        }
+
+    def iter_schedule(self, principal: float, interest_rate: float, periods: int) -> Iterator[ScheduleRow]:
+        i = interest_rate
+        if i == 0:
+            amort = principal / periods
             for k in range(1, periods + 1):
-                payment = amort
-                remaining = max(0.0, remaining - amort)
-                schedule.append({
-                    "period": k,
-                    "payment": payment,
-                    "interest": 0.0,
-                    "amortization": amort,
-                    "remaining": remaining
-                })
-            return schedule
-
-        annuity = principal * i / (1 - (1 + i) ** (-periods))
-        remaining = principal
+                yield ScheduleRow(
+                    period=k,
+                    payment=amort,
+                    interest=0.0,
+                    amortization=amort,
+                    remaining=max(0.0, principal - k * amort),
+                )
+            return
+
+        # Misma fórmula cerrada que build_columns, evaluada período a período.
+        log_g = log1p(i)
+        a_n = _annuity_factor(log_g, periods)
+        annuity = principal * i / a_n
+        opening = principal
         for k in range(1, periods + 1):
-            interest = remaining * i
-            amort = annuity - interest
-            remaining = max(0.0, remaining - amort)
-            schedule.append({
-                "period": k,
-                "payment": annuity,
-                "interest": interest,
-                "amortization": amort,
-                "remaining": remaining
-            })
+            interest = opening * i
+            closing = principal * _annuity_factor(log_g, periods - k) / a_n
+            yield ScheduleRow(
+                period=k,
+                payment=annuity,
+                interest=interest,
+                amortization=annuity - interest,
+                remaining=max(0.0, closing),
+            )
+            opening = closing
+
+    def totals(self, principal: float, interest_rate: float, periods: int) -> Tuple[float, float]:
+        i = interest_rate
+        if i == 0:
+            return principal, 0.0
+        # anualidad * n
+        total_paid = principal * i / _annuity_factor(log1p(i), periods) * periods
+        return total_paid, total_paid - principal
+
+    def max_principal_for_payment(self, max_payment: float, interest_rate: float, periods: int) -> float:
+        # Valor presente de la anualidad: P = A * (1 - (1+i)^-n) / i
+        i = interest_rate
+        if i == 0:
+            return max_payment * periods
+        return max_payment * _annuity_factor(log1p(i), periods) / i
+
+    def min_periods_for_payment(self, principal: float, max_payment: float, interest_rate: float,
+                                max_periods: int = MAX_PERIODS) -> Optional[int]:
+        # A(n) <= X  =>  n >= -log(1 - P*i/X) / log(1+i)
+        i = interest_rate
+        if max_payment <= 0:
+            return None
+        if i == 0:
+            n = max(1, ceil(principal / max_payment - 1e-9))
+        else:
+            ratio = principal * i / max_payment
+            if ratio >= 1:
+                return None   # la cuota no llega a cubrir el interés
+            n = max(1, ceil(-log1p(-ratio) / log1p(i) - 1e-9))
+        return n if n <= max_periods else None
+
+    def build_tail(self, opening_balance: float, interest_rates: Sequence[float], first_period: int = 1) -> Columns:
+        m = len(interest_rates)
+        payment, interest, amortization, remaining = (array("d", [0.0]) * m for _ in range(4))
+        balance, rate, annuity = opening_balance, None, 0.0
+        for j, r in enumerate(interest_rates):
+            if r != rate:
+                # Cambio de tasa: nueva cuota sobre el saldo y el plazo restantes.
+                rate, left = r, m - j
+                if r == 0:
+                    annuity = balance / left
+                else:
+                    annuity = balance * r / _annuity_factor(log1p(r), left)
+            interest[j] = balance * r
+            amortization[j] = annuity - interest[j]
+            balance = max(0.0, balance - amortization[j])
+            remaining[j] = balance
+        # La última cuota cancela el saldo que quede por redondeo de punto flotante.
+        amortization[-1] += remaining[-1]
+        remaining[-1] = 0.0
+        for j in range(m):
+            payment[j] = interest[j] + amortization[j]
+        return {
+            "period": array("q", range(first_period, first_period + m)),
+            "payment": payment,
+            "interest": interest,
+            "amortization": amortization,
+            "remaining": remaining,
+        }
+
+    def build_columns_cents(self, principal_cents: int, interest_rate: float, periods: int) -> Columns:
+        i = interest_rate
+        if i == 0:
+            return _linear_cents(principal_cents, 0.0, periods)
+        # Saldos de la fórmula cerrada redondeados a centavos: la amortización es la
+        # diferencia entre saldos, así suma exactamente el capital y no acumula
+        # error (una cuota fija redondeada se amplifica como (1+i)^k en el saldo).
+        # La cuota queda constante a +-1 centavo y la última absorbe el ajuste.
+        log_g = log1p(i)
+        a_n = _annuity_factor(log_g, periods)
+        balance = array("q", [principal_cents])
+        balance.extend(round_cents(principal_cents * _annuity_factor(log_g, periods - k) / a_n)
+                       for k in range(1, periods))
+        balance.append(0)
+        return _cents_from_balances(balance, i, periods)
+
+
+# ==============================================
+# 2b) Caché LRU de cronogramas (thread-safe)
+# ==============================================
+class ScheduleCache:
+    """
+    Memoización LRU acotada de cronogramas, clave (estrategia, principal, tasa, períodos).
+    Guarda cronogramas inmutables (Schedule) para que nadie pueda modificar
+    una entrada compartida. Cuenta hits/misses/evictions.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser un entero positivo.")
+        self._maxsize = int(maxsize)
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Schedule]) -> Schedule:
+        """Devuelve el cronograma cacheado para key o lo arma con build() y lo guarda."""
+        with self._lock:
+            schedule = self._data.get(key)
+            if schedule is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return schedule
+            self.misses += 1
+        # Se arma fuera del lock: dos hilos pueden calcular la misma clave, el resultado es idéntico.
+        schedule = build()
+        with self._lock:
+            self._data[key] = schedule
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
         return schedule
 
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores para exportar (hits, misses, evictions, size, maxsize)."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self._maxsize,
+            }
+
+    def __repr__(self) -> str:
+        return f"ScheduleCache({self.stats()})"
+
+
+# ==========================================================
+# 2c) Cronograma por segmentos (prepagos y cambios de tasa)
+# ==========================================================
+class SegmentedSchedule:
+    """
+    Cronograma dividido en segmentos para eventos a mitad de plazo. Un prepago
+    parcial o un cambio de tasa en el período k conserva las filas 1..k-1 y
+    recalcula sólo la cola con strategy.build_tail: el costo de cada evento es
+    proporcional al plazo restante, no al préstamo completo.
+    El prepago se suma al pago y a la amortización del período k; el plazo no cambia
+    (baja la cuota). Los eventos quedan guardados (cambio de tasa y prepago por
+    período, y la tasa vigente se rearma desde los cambios guardados): uno anterior a
+    otros ya aplicados vuelve a aplicar los posteriores, así que el orden de las
+    llamadas no cambia el resultado. Un evento inválido no modifica nada.
+
+    >>> s1 = SegmentedSchedule(FrenchStrategy(), 10_000, 0.03, 12).reset_rate(10, 0.05).prepay(5, 100)
+    >>> s2 = SegmentedSchedule(FrenchStrategy(), 10_000, 0.03, 12).prepay(5, 100).reset_rate(10, 0.05)
+    >>> s1.rates[9], list(s1) == list(s2)
+    (0.05, True)
+    >>> r1 = SegmentedSchedule(FrenchStrategy(), 10_000, 0.03, 12).reset_rate(10, 0.05).reset_rate(5, 0.04)
+    >>> r2 = SegmentedSchedule(FrenchStrategy(), 10_000, 0.03, 12).reset_rate(5, 0.04).reset_rate(10, 0.05)
+    >>> r1.rates.tolist()[4:], r1.resets, list(r1) == list(r2)
+    ([0.04, 0.04, 0.04, 0.04, 0.04, 0.05, 0.05, 0.05], {10: 0.05, 5: 0.04}, True)
+    >>> s3 = SegmentedSchedule(FrenchStrategy(), 10_000, 0.03, 12).prepay(10, 100).reset_rate(5, 0.05)
+    >>> s4 = SegmentedSchedule(FrenchStrategy(), 10_000, 0.03, 12).reset_rate(5, 0.05).prepay(10, 100)
+    >>> s3.prepayments[9], list(s3) == list(s4)
+    (100.0, True)
+    >>> s3.prepay(6, 10_000)
+    Traceback (most recent call last):
+    ...
+    ValueError: El prepago supera el saldo pendiente.
+    >>> len(s3), len(list(s3)), list(s3) == list(s4)
+    (12, 12, True)
+    """
+
+    def __init__(self, strategy: RepaymentStrategy, principal: float, interest_rate: float, periods: int) -> None:
+        self.strategy = strategy
+        self.principal = principal
+        self._rates = array("d", [interest_rate]) * periods
+        self._prepayments = array("d", [0.0]) * periods
+        self._resets: Dict[int, float] = {}     # período -> tasa desde ese período
+        # (segmento, filas vigentes); el primer período de cada segmento es su fila 0
+        self._segments: List[Tuple[Schedule, int]] = [
+            (Schedule(strategy.build_columns(principal, interest_rate, periods)), periods)]
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    @property
+    def rates(self) -> memoryview:
+        """Tasa vigente de cada período (sólo lectura)."""
+        return memoryview(self._rates).toreadonly()
+
+    @property
+    def prepayments(self) -> memoryview:
+        """Prepago de cada período (sólo lectura)."""
+        return memoryview(self._prepayments).toreadonly()
+
+    @property
+    def resets(self) -> Dict[int, float]:
+        """Cambios de tasa guardados: {período: tasa} (copia)."""
+        return dict(self._resets)
+
+    @property
+    def segments(self) -> List[Schedule]:
+        return [segment[:used] for segment, used in self._segments]
+
+    def __iter__(self) -> Iterator[ScheduleRow]:
+        for segment, used in self._segments:
+            for k, row in enumerate(segment):
+                if k == used:
+                    break
+                yield row
+
+    def __getitem__(self, index: int) -> ScheduleRow:
+        period = (index if index >= 0 else len(self) + index) + 1
+        for segment, used in self._segments:
+            first = segment[0].period
+            if first <= period < first + used:
+                return segment[period - first]
+        raise IndexError("Período fuera del cronograma.")
+
+    def apply_event(self, period: int, interest_rate: Optional[float] = None,
+                    prepayment: float = 0.0) -> "SegmentedSchedule":
+        """
+        Aplica desde `period` una nueva tasa (reemplaza otro cambio del mismo período;
+        rige hasta el próximo cambio guardado) y/o un prepago parcial (se suma a otro
+        prepago del mismo período). Devuelve self. ValueError, sin cambiar nada, si
+        un prepago (este o uno posterior ya guardado) supera el saldo pendiente.
+        """
+        if not (1 <= period <= len(self)):
+            raise ValueError(f"El período debe estar entre 1 y {len(self)}.")
+        if interest_rate is not None and not (0.0 <= interest_rate < 1.0):
+            raise ValueError("interest_rate debe estar en [0, 1). Use 0.03 para 3% por período.")
+        if prepayment < 0:
+            raise ValueError("El prepago no puede ser negativo.")
+
+        # Todo se calcula sobre copias de la cola; _segments sólo cambia si no hubo errores.
+        n = len(self)
+        rates = self._rates[period - 1:]
+        resets = self._resets
+        if interest_rate is not None:
+            resets = dict(resets)
+            resets[period] = rate = interest_rate
+            for j in range(len(rates)):
+                rate = resets.get(period + j, rate)
+                rates[j] = rate
+        prepayments = self._prepayments[period - 1:]
+        prepayments[0] += prepayment
+        balance = self[period - 2].remaining if period > 1 else self.principal
+
+        # Un segmento desde `period` y otro desde cada prepago posterior ya guardado.
+        starts = [period] + [period + j for j in range(1, len(prepayments)) if prepayments[j]]
+        tails = []
+        for start, stop in zip(starts, starts[1:] + [n + 1]):
+            paid = prepayments[start - period]
+            if paid > balance:
+                raise ValueError("El prepago supera el saldo pendiente.")
+            tail = self.strategy.build_tail(balance - paid, rates[start - period:], start)
+            tail["payment"][0] += paid
+            tail["amortization"][0] += paid
+            tails.append((Schedule(tail), stop - start))
+            balance = tail["remaining"][stop - start - 1]
+
+        # Descartar (sin copiar) lo que queda desde `period` en adelante.
+        while self._segments and self._segments[-1][0][0].period >= period:
+            self._segments.pop()
+        if self._segments:
+            segment, _ = self._segments[-1]
+            self._segments[-1] = (segment, period - segment[0].period)
+        self._segments.extend(tails)
+        self._rates[period - 1:] = rates
+        self._prepayments[period - 1:] = prepayments
+        self._resets = resets
+        return self
+
+    def reset_rate(self, period: int, interest_rate: float) -> "SegmentedSchedule":
+        return self.apply_event(period, interest_rate=interest_rate)
+
+    def prepay(self, period: int, amount: float) -> "SegmentedSchedule":
+        return self.apply_event(period, prepayment=amount)
+
+    def to_schedule(self) -> Schedule:
+        """Cronograma completo en un único Schedule (copia las columnas)."""
+        cols = {c: array("q" if c == "period" else "d") for c in COLUMNS}
+        for segment, used in self._segments:
+            for c in COLUMNS:
+                cols[c].extend(segment.column(c)[:used])
+        return Schedule(cols)
+
+    def __repr__(self) -> str:
+        return f"SegmentedSchedule(periods={len(self)}, segments={len(self._segments)})"
+
+
+# ======================================================
+# 2d) Costo financiero total (CFT): TIR de los flujos
+# ======================================================
+@dataclass
+class IRRResult:
+    """Resultado de effective_rates: una entrada por préstamo, en el orden de entrada."""
+    rates: array        # TIR por período (nan si no convergió o los datos no sirven)
+    iterations: array   # iteraciones de Newton usadas
+    converged: array    # 1 si convergió, 0 si no
+    residuals: array    # VAN en la última iteración (en unidades de moneda)
+
+    @property
+    def all_converged(self) -> bool:
+        return all(self.converged)
+
+    def failed(self) -> List[int]:
+        """Índices de los préstamos que no convergieron."""
+        return [j for j, ok in enumerate(self.converged) if not ok]
+
+
+def effective_rates(payments: Sequence[Sequence[float]], disbursements: Sequence[float],
+                    guesses: Optional[Sequence[float]] = None, tol: float = 1e-12,
+                    max_iter: int = 50) -> IRRResult:
+    """
+    TIR por período de muchos préstamos a la vez: la tasa r que iguala lo desembolsado
+    (neto de gastos) con los pagos: disbursement = sum(payment_t / (1 + r)^t), t = 1..n.
+
+    payments[j] es la columna de pagos del préstamo j (schedule.column("payment"),
+    un array o una lista), con gastos periódicos ya sumados si corresponde.
+    Newton en paralelo sobre v = 1/(1+r): el VAN es un polinomio en v (Horner da
+    valor y derivada en una pasada) y, con pagos >= 0, es creciente y convexo, así
+    que la iteración converge sin salvaguardas. Cada ronda sólo recorre los
+    préstamos que todavía no convergieron. Un préstamo sin pagos positivos (o con
+    derivada nula) no tiene TIR: queda como no convergido, con nan, sin frenar al resto.
+
+    >>> result = effective_rates([[0.0, 0.0], [60.0, 60.0]], [100.0, 100.0])
+    >>> result.failed(), round(result.rates[1], 6)
+    ([0], 0.130662)
+    >>> round(effective_rates([[60.0, 60.0]], [100.0], guesses=array("d", [0.1])).rates[0], 6)
+    0.130662
+    """
+    m = len(payments)
+    if len(disbursements) != m or (guesses is not None and len(guesses) != m):
+        raise ValueError("payments, disbursements y guesses deben tener el mismo largo.")
+    v = array("d", [1.0 / (1.0 + g) for g in guesses]) if guesses is not None else array("d", [1.0]) * m
+    iterations = array("q", bytes(8 * m))
+    converged = array("b", bytes(m))
+    residuals = array("d", bytes(8 * m))
+
+    active = [j for j in range(m) if disbursements[j] > 0 and any(p > 0 for p in payments[j])]
+    for it in range(1, max_iter + 1):
+        remaining = []
+        for j in active:
+            vj = v[j]
+            h = dh = 0.0
+            for p in reversed(payments[j]):
+                dh = dh * vj + h
+                h = h * vj + p
+            npv = vj * h - disbursements[j]
+            slope = h + vj * dh
+            if slope == 0:   # Newton no puede avanzar: se deja sin converger
+                residuals[j] = npv
+                continue
+            step = npv / slope
+            vj -= step
+            v[j], iterations[j], residuals[j] = vj, it, npv
+            if abs(step) <= tol * vj:
+                converged[j] = 1
+            else:
+                remaining.append(j)
+        active = remaining
+        if not active:
+            break
+
+    rates = array("d", [1.0 / vj - 1.0 if ok else float("nan") for vj, ok in zip(v, converged)])
+    return IRRResult(rates, iterations, converged, residuals)
+
+
+def annual_rate(periodic_rate: float, periods_per_year: int = 12) -> float:
+    """Tasa efectiva anual equivalente: (1 + r)^k - 1 (expm1/log1p para tasas chicas)."""
+    return expm1(periods_per_year * log1p(periodic_rate))
+
+
+def summarize_rows(rows: Iterable[ScheduleRow], row_sink: Optional[Callable[[ScheduleRow], None]] = None
+                   ) -> Tuple[float, float]:
+    """(total_paid, total_interest) consumiendo las filas en una sola pasada."""
+    total_paid = total_interest = 0.0
+    for row in rows:
+        total_paid += row["payment"]
+        total_interest += row["interest"]
+        if row_sink is not None:
+            row_sink(row)
+    return total_paid, total_interest
+
 
 # ===================================================
 # 3) Loan base: usa Strategy + validaciones (@property)
@@ -182,16 +1031,35 @@ class Loan(ABC):
     y un Factory para instanciar variantes.
     Todas las variantes deben validar interés y períodos por @property.
     """
+    # Caché compartida de cronogramas (None la desactiva).
+    schedule_cache: Optional[ScheduleCache] = ScheduleCache()
+    # Estrategia compartida por todas las instancias de la clase (flyweight: no tiene estado).
+    STRATEGY: Optional[RepaymentStrategy] = None
+    # Último resumen de cada préstamo: se reusa mientras no cambie el capital aprobado
+    # (False lo desactiva, p. ej. para medir el cálculo en los benchmarks).
+    keep_last_summary: bool = True
+    _last_summary: Optional[Tuple] = None   # (clave, versión de la cuenta, capital aprobado, resumen)
 
-    def __init__(self, account: BankAccount, interest_rate: float, periods: int, strategy: RepaymentStrategy) -> None:
+    def __init__(self, account: BankAccount, interest_rate: float, periods: int,
+                 strategy: Optional[RepaymentStrategy] = None) -> None:
         self._account = account
         self._interest_rate = 0.0
         self._periods = 0
-        self.strategy = strategy
+        self.strategy = strategy if strategy is not None else self.STRATEGY
 
         self.interest_rate = interest_rate  # valida (setter)
         self.periods = periods              # valida (setter)
 
+    @classmethod
+    def _from_validated(cls, account: BankAccount, interest_rate: float, periods: int) -> "Loan":
+        """Constructor sin setters para lotes ya validados (LoanFactory.create_many)."""
+        loan = cls.__new__(cls)
+        loan._account = account
+        loan._interest_rate = interest_rate
+        loan._periods = periods
+        loan.strategy = cls.STRATEGY
+        return loan
+
     @property
     def account(self) -> BankAccount:
         return self._account
@@ -230,19 +1098,131 @@ class Loan(ABC):
         """Calcula cuánto se puede prestar en función del balance de la cuenta."""
         return self.account.balance * self.approval_multiplier()
 
-    # --- Cronograma de pagos ---
-    def build_schedule(self, requested_principal: float) -> List[Dict]:
-        """Limita el capital al máximo permitible y arma el cronograma con la Strategy."""
+    def _financeable_principal(self, requested_principal: float) -> float:
+        """Limita el capital al máximo permitible; error si no queda nada para prestar."""
         principal = min(requested_principal, self.max_principal_allowed())
         if principal <= 0:
             raise ValueError("El principal solicitado no es financiable (verifique el balance).")
-        return self.strategy.build_schedule(principal, self.interest_rate, self.periods)
+        return principal
+
+    # --- Cronograma de pagos ---
+    def build_schedule(self, requested_principal: float) -> Schedule:
+        """
+        Limita el capital al máximo permitible y arma el cronograma con la Strategy.
+        Siempre es un Schedule armado desde build_columns (inmutable aunque la estrategia
+        devuelva dicts); con schedule_cache activa, el compartido de la caché.
+
+        >>> class Cuotas(RepaymentStrategy):          # contrato anterior: filas dict
+        ...     name = "cuotas"
+        ...     def build_schedule(self, p, i, n):
+        ...         return [{"period": k, "payment": p / n, "interest": 0.0, "amortization": p / n,
+        ...                  "remaining": p - k * p / n} for k in range(1, n + 1)]
+        >>> loan = FrenchLoan(BankAccount("Ana", 5_000.0), 0.0, 4, strategy=Cuotas())
+        >>> loan.schedule_cache = None
+        >>> loan.build_schedule(1_000.0), loan.effective_cost(1_000.0)["converged"]
+        (Schedule(periods=4), True)
+        """
+        principal = self._financeable_principal(requested_principal)
+
+        def build() -> Schedule:
+            return Schedule(self.strategy.build_columns(principal, self.interest_rate, self.periods))
+
+        if self.schedule_cache is None:
+            return build()
+        # La clave es la instancia: dos estrategias de la misma clase configuradas distinto
+        # no comparten cronogramas (las de cada Loan son flyweights, así que no cuesta aciertos).
+        return self.schedule_cache.get_or_build((self.strategy, principal, self.interest_rate, self.periods), build)
 
-    def summary(self, requested_principal: float) -> Dict:
-        schedule = self.build_schedule(requested_principal)
-        total_paid = sum(row["payment"] for row in schedule)
-        total_interest = sum(row["interest"] for row in schedule)
+    def affordable_principal(self, max_payment: float) -> float:
+        """Cuánto puede pedir el cliente si su cuota no puede superar max_payment (tope: max_principal_allowed)."""
+        solved = self.strategy.max_principal_for_payment(max_payment, self.interest_rate, self.periods)
+        return max(0.0, min(solved, self.max_principal_allowed()))
+
+    def build_schedule_cents(self, requested_principal: float) -> Schedule:
+        """Cronograma exacto al centavo (todas las columnas en centavos enteros)."""
+        principal = self._financeable_principal(requested_principal)
+        return Schedule(self.strategy.build_columns_cents(to_cents(principal), self.interest_rate, self.periods))
+
+    def segmented_schedule(self, requested_principal: float) -> SegmentedSchedule:
+        """Cronograma por segmentos, para aplicar prepagos o cambios de tasa sin rearmarlo entero."""
+        principal = self._financeable_principal(requested_principal)
+        return SegmentedSchedule(self.strategy, principal, self.interest_rate, self.periods)
+
+    def iter_schedule(self, requested_principal: float) -> Iterator[ScheduleRow]:
+        """Como build_schedule, pero genera las filas de a una (memoria constante)."""
+        principal = self._financeable_principal(requested_principal)  # valida antes de iterar
+        return self.strategy.iter_schedule(principal, self.interest_rate, self.periods)
+
+    def totals(self, requested_principal: float) -> Tuple[float, float]:
+        """(total_paid, total_interest) en O(1), sin materializar el cronograma."""
+        principal = self._financeable_principal(requested_principal)
+        return self.strategy.totals(principal, self.interest_rate, self.periods)
+
+    def effective_cost(self, requested_principal: float, upfront_fee: float = 0.0,
+                       periodic_fee: float = 0.0, periods_per_year: int = 12) -> Dict[str, float]:
+        """
+        CFT del préstamo: TIR de los flujos (capital aprobado - upfront_fee al inicio,
+        cuota + periodic_fee en cada período). Sin gastos coincide con interest_rate.
+        """
+        principal = self._financeable_principal(requested_principal)
+        if not (0.0 <= upfront_fee < principal) or periodic_fee < 0:
+            raise ValueError("Los gastos deben ser >= 0 y upfront_fee menor que el capital aprobado.")
+        payments = self.build_schedule(requested_principal).column("payment")
+        if periodic_fee:
+            payments = array("d", [p + periodic_fee for p in payments])
+        result = effective_rates([payments], [principal - upfront_fee], [self.interest_rate])
+        rate = result.rates[0]
         return {
+            "periodic_rate": rate,
+            "annual_rate": annual_rate(rate, periods_per_year),
+            "iterations": result.iterations[0],
+            "converged": bool(result.converged[0]),
+        }
+
+    def summary(self, requested_principal: float, include_schedule: bool = True,
+                row_sink: Optional[Callable[[ScheduleRow], None]] = None) -> Dict:
+        """
+        Resumen del préstamo. Los totales salen de la fórmula cerrada de la Strategy;
+        el cronograma sólo se arma si include_schedule=True.
+        Con row_sink, recorre iter_schedule una sola vez: cada fila va a row_sink
+        (archivo, socket...) y los totales se acumulan en la misma pasada.
+
+        El préstamo guarda su último resumen. Si la cuenta no cambió (misma version)
+        se devuelve sin recalcular; si cambió pero el capital aprobado es el mismo
+        (p. ej. un depósito cuando ya se aprobaba todo lo pedido), también.
+        Cambiar la estrategia del préstamo invalida el resumen guardado:
+
+        >>> loan = FrenchLoan(BankAccount("Ana", 5_000.0), 0.03, 12)
+        >>> loan.summary(1_000.0)["strategy"]
+        'frances'
+        >>> loan.strategy = GermanStrategy()
+        >>> loan.summary(1_000.0)["strategy"]
+        'aleman'
+        """
+        if row_sink is not None or not self.keep_last_summary:
+            return self._summary(requested_principal, include_schedule, row_sink)
+        key = (requested_principal, include_schedule, self.interest_rate, self.periods, self.strategy)
+        version = self.account.version
+        last = self._last_summary
+        if last is not None and last[0] == key:
+            if last[1] == version:
+                return dict(last[3])
+            approved = min(requested_principal, self.max_principal_allowed())
+            if approved == last[2]:
+                self._last_summary = (key, version, approved, last[3])
+                return dict(last[3])
+        info = self._summary(requested_principal, include_schedule, None)
+        self._last_summary = (key, version, info["approved_principal"], info)
+        return dict(info)
+
+    def _summary(self, requested_principal: float, include_schedule: bool,
+                 row_sink: Optional[Callable[[ScheduleRow], None]]) -> Dict:
+        if row_sink is not None:
+            total_paid, total_interest = summarize_rows(self.iter_schedule(requested_principal), row_sink)
+            include_schedule = False
+        else:
+            total_paid, total_interest = self.totals(requested_principal)
+        info = {
             "type": type(self).__name__,
             "strategy": self.strategy.name,
             "approved_principal": min(requested_principal, self.max_principal_allowed()),
@@ -250,8 +1230,10 @@ class Loan(ABC):
             "interest_rate": self.interest_rate,
             "total_paid": total_paid,
             "total_interest": total_interest,
-            "schedule": schedule,
         }
+        if include_schedule:
+            info["schedule"] = self.build_schedule(requested_principal)
+        return info
 
 
 # ===========================================================
@@ -259,8 +1241,7 @@ class Loan(ABC):
 # ===========================================================
 class GermanLoan(Loan):
     """Hereda de Loan y fija Strategy Alemana. Multiplicador conservador."""
-    def __init__(self, account: BankAccount, interest_rate: float, periods: int) -> None:
-        super().__init__(account, interest_rate, periods, strategy=GermanStrategy())
+    STRATEGY = GermanStrategy()
 
     def approval_multiplier(self) -> float:
         # Ejemplo: conservador (2x el balance)
@@ -269,8 +1250,7 @@ class GermanLoan(Loan):
 
 class AmericanLoan(Loan):
     """Hereda de Loan y fija Strategy Americana."""
-    def __init__(self, account: BankAccount, interest_rate: float, periods: int) -> None:
-        super().__init__(account, interest_rate, periods, strategy=AmericanStrategy())
+    STRATEGY = AmericanStrategy()
 
     def approval_multiplier(self) -> float:
         # Ejemplo: más restrictivo (1.5x) por alto pago final (bullet)
@@ -279,8 +1259,7 @@ class AmericanLoan(Loan):
 
 class FrenchLoan(Loan):
     """Hereda de Loan y fija Strategy Francesa."""
-    def __init__(self, account: BankAccount, interest_rate: float, periods: int) -> None:
-        super().__init__(account, interest_rate, periods, strategy=FrenchStrategy())
+    STRATEGY = FrenchStrategy()
 
     def approval_multiplier(self) -> float:
         # Ejemplo: algo más flexible (3x) por cuota nivelada
@@ -290,10 +1269,52 @@ class FrenchLoan(Loan):
 # =======================
 # 5) Loan Factory (Simple)
 # =======================
+def normalize_kind(kind: str) -> str:
+    """Etiqueta canónica: sin acentos, en minúsculas y con los espacios colapsados ("  Francés " -> "frances")."""
+    decomposed = unicodedata.normalize("NFKD", kind)
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
+
+class KindAliases:
+    """
+    Tabla de alias prearmada para resolver etiquetas de tipo con un solo dict.get.
+    Las etiquetas del registro y sus formas normalizadas se cargan de entrada; una
+    variante nueva ("FRANCÉS ", "Frances") se normaliza una vez y queda memorizada
+    (hasta max_size alias, para no crecer con basura).
+    """
+
+    def __init__(self, registry: Dict[str, type], max_size: int = 1024) -> None:
+        self._canonical = {normalize_kind(kind): target for kind, target in registry.items()}
+        self._aliases = {**registry, **self._canonical}
+        self.max_size = max_size
+
+    def resolve(self, kind: str) -> Optional[type]:
+        target = self._aliases.get(kind)
+        if target is None:
+            target = self._canonical.get(normalize_kind(kind))
+            if target is not None and len(self._aliases) < self.max_size:
+                self._aliases[kind] = target
+        return target
+
+
+def broadcast_columns(*columns) -> Tuple[int, List[Sequence]]:
+    """
+    Iguala columnas de un lote: los escalares (y los str) se repiten al largo común.
+    Devuelve (largo, columnas). ValueError si dos secuencias tienen largos distintos.
+    """
+    lengths = {len(c) for c in columns if hasattr(c, "__len__") and not isinstance(c, str)}
+    if len(lengths) > 1:
+        raise ValueError("Todas las columnas del lote deben tener el mismo largo.")
+    n = lengths.pop() if lengths else 1
+    return n, [c if hasattr(c, "__len__") and not isinstance(c, str) else [c] * n for c in columns]
+
+
 class LoanFactory:
     """
     Crea instancias de préstamos en base a una etiqueta.
     Integra con Strategy (cada Loan fija su estrategia).
+    Las etiquetas se resuelven con una tabla de alias prearmada (acentos,
+    mayúsculas y espacios no importan). Para agregar tipos, usar register().
     """
     REGISTRY = {
         "aleman": GermanLoan,
@@ -302,14 +1323,53 @@ class LoanFactory:
         "frances": FrenchLoan, 
         "francés": FrenchLoan, 
     }
+    _aliases = KindAliases(REGISTRY)
 
     @classmethod
-    def create(cls, kind: str, account: BankAccount, interest_rate: float, periods: int) -> Loan:
-        kind = kind.strip().lower()
-        if kind not in cls.REGISTRY:
-            raise ValueError(f"Tipo de crédito desconocido: {kind!r}. "
+    def register(cls, kind: str, loan_cls: type) -> None:
+        cls.REGISTRY[kind] = loan_cls
+        cls._aliases = KindAliases(cls.REGISTRY)
+
+    @classmethod
+    def resolve(cls, kind: str) -> type:
+        """Clase de préstamo para una etiqueta (ValueError si no existe)."""
+        loan_cls = cls._aliases.resolve(kind)
+        if loan_cls is None:
+            raise ValueError(f"Tipo de crédito desconocido: {normalize_kind(kind)!r}. "
                              f"Use uno de: {', '.join(sorted(cls.REGISTRY))}")
-        return cls.REGISTRY[kind](account, interest_rate, periods)
+        return loan_cls
+
+    @classmethod
+    def create(cls, kind: str, account: BankAccount, interest_rate: float, periods: int) -> Loan:
+        return cls.resolve(kind)(account, interest_rate, periods)
+
+    @classmethod
+    def create_many(cls, kinds: Union[str, Sequence[str]], accounts: Union[BankAccount, Sequence[BankAccount]],
+                    interest_rates: Union[float, Sequence[float]], periods: Union[int, Sequence[int]]) -> List[Loan]:
+        """
+        Crea un lote de préstamos (columnas del mismo largo; un escalar vale para todo el lote).
+        Valida una vez por lote: cada etiqueta distinta se resuelve una sola vez y tasas y
+        plazos se chequean en una pasada; después los préstamos se arman sin setters.
+        ValueError indica el primer préstamo inválido.
+        """
+        n, (kinds, accounts, interest_rates, periods) = broadcast_columns(kinds, accounts, interest_rates, periods)
+        classes = {kind: cls.resolve(kind) for kind in set(kinds)}
+        rates = [float(r) for r in interest_rates]
+        terms = [int(t) for t in periods]
+        for idx in range(n):
+            if not (0.0 <= rates[idx] < 1.0):
+                raise ValueError(f"interest_rate fuera de [0, 1) en el préstamo {idx}.")
+            if terms[idx] <= 0:
+                raise ValueError(f"periods debe ser positivo en el préstamo {idx}.")
+
+        loans = []
+        for kind, account, rate, term in zip(kinds, accounts, rates, terms):
+            loan_cls = classes[kind]
+            if loan_cls.STRATEGY is not None and loan_cls.__init__ is Loan.__init__:
+                loans.append(loan_cls._from_validated(account, rate, term))
+            else:   # clases registradas con su propio __init__: constructor normal
+                loans.append(loan_cls(account, rate, term))
+        return loans
 
 
 # ======================================
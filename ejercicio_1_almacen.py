@@ -0,0 +1,214 @@
+#Almacén binario de cronogramas (salida de Loan.summary).
+#Formato (little endian en todas las partes, también columnas e índice):
+#  cabecera de archivo: magic b"SCHD", versión, cantidad de préstamos, offset del índice
+#  por préstamo: cabecera fija con metadatos + 5 bloques float64 (una columna cada uno)
+#  al final: índice con el offset de cada préstamo (acceso aleatorio)
+#El lector hace mmap del archivo y expone las columnas como memoryview sin copia
+#(en un host big endian se invierten los bytes, así que ahí sí copia).
+
+from __future__ import annotations
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, Mapping
+
+from ejercicio_1 import COLUMNS, Schedule
+
+MAGIC = b"SCHD"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHxxQQ")          # magic, versión, cantidad, offset del índice
+LOAN_HEADER = struct.Struct("<32s32sddddQ")      # type, strategy, approved, tasa, total_paid, total_interest, períodos
+NAME_SIZE = 32                                   # bytes de type/strategy en LOAN_HEADER
+# array escribe y lee en el orden nativo: fuera de little endian hay que invertir los bytes.
+_SWAP = sys.byteorder != "little"
+
+
+def _encode_name(name: str) -> bytes:
+    """
+    UTF-8 de a lo sumo NAME_SIZE bytes, cortado en un límite de carácter (así el
+    lector siempre puede decodificarlo).
+
+    >>> _encode_name("Préstamo" * 5).decode("utf-8")
+    'PréstamoPréstamoPréstamoPrés'
+    >>> len(_encode_name("é" * 20)), _encode_name("é" * 20).decode("utf-8") == "é" * 16
+    (32, True)
+    """
+    return name.encode("utf-8")[:NAME_SIZE].decode("utf-8", "ignore").encode("utf-8")
+
+
+def _little_endian(values: array) -> array:
+    """El array tal cual en un host little endian; si no, una copia con los bytes invertidos."""
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _read_array(typecode: str, data: memoryview) -> array:
+    """Copia de un bloque little endian del archivo como array nativo (para hosts big endian)."""
+    values = array(typecode)
+    values.frombytes(data)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def _column_blocks(schedule) -> Iterator[array]:
+    """Columnas float64 del cronograma (Schedule sin copiar filas; otros, fila por fila)."""
+    if isinstance(schedule, Schedule):
+        for name in COLUMNS:
+            col = schedule.column(name)
+            yield col if col.format == "d" and not _SWAP else _little_endian(array("d", col))
+        return
+    rows = list(schedule)
+    for name in COLUMNS:
+        yield _little_endian(array("d", [row[name] for row in rows]))
+
+
+class ScheduleWriter:
+    """
+    Escribe varios resúmenes (con "schedule") en un archivo binario.
+    Usar como context manager: al cerrar se escribe el índice de offsets.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "wb")
+        self._offsets = array("Q")
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, 0, 0))  # se completa en close()
+
+    def write(self, info: Mapping) -> int:
+        """Agrega un resumen de Loan.summary(). Devuelve su posición en el archivo."""
+        if "schedule" not in info:
+            raise ValueError("El resumen no incluye 'schedule' (use include_schedule=True).")
+        blocks = list(_column_blocks(info["schedule"]))
+        periods = len(blocks[0])
+        self._offsets.append(self._file.tell())
+        self._file.write(LOAN_HEADER.pack(
+            _encode_name(info["type"]), _encode_name(info["strategy"]),
+            info["approved_principal"], info["interest_rate"],
+            info["total_paid"], info["total_interest"], periods,
+        ))
+        for block in blocks:
+            self._file.write(block)
+        return len(self._offsets) - 1
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(_little_endian(self._offsets))
+        self._file.seek(0)
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, len(self._offsets), index_offset))
+        self._file.close()
+
+    def __enter__(self) -> "ScheduleWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def write_summaries(path: str, summaries: Iterable[Mapping]) -> int:
+    """Atajo: escribe todos los resúmenes y devuelve cuántos se guardaron."""
+    with ScheduleWriter(path) as writer:
+        count = 0
+        for info in summaries:
+            writer.write(info)
+            count += 1
+    return count
+
+
+class StoredLoan:
+    """Un préstamo dentro del archivo: metadatos + columnas como memoryview (sin copia)."""
+
+    def __init__(self, buffer: memoryview, offset: int) -> None:
+        (type_, strategy, self.approved_principal, self.interest_rate,
+         self.total_paid, self.total_interest, self.periods) = LOAN_HEADER.unpack_from(buffer, offset)
+        self.type = type_.rstrip(b"\0").decode("utf-8")
+        self.strategy = strategy.rstrip(b"\0").decode("utf-8")
+        self._buffer = buffer
+        self._data = offset + LOAN_HEADER.size
+
+    def column(self, name: str) -> memoryview:
+        """Columna float64 como memoryview de sólo lectura sobre el mmap (np.frombuffer la acepta)."""
+        k = COLUMNS.index(name)
+        size = 8 * self.periods
+        start = self._data + k * size
+        if _SWAP:
+            return memoryview(_read_array("d", self._buffer[start:start + size])).toreadonly()
+        return self._buffer[start:start + size].cast("d")
+
+    def columns(self) -> Dict[str, memoryview]:
+        return {name: self.column(name) for name in COLUMNS}
+
+    def __repr__(self) -> str:
+        return (f"StoredLoan(type={self.type!r}, strategy={self.strategy!r}, "
+                f"approved_principal={self.approved_principal:.2f}, periods={self.periods})")
+
+
+class ScheduleStore:
+    """
+    Lector por mmap de un archivo escrito con ScheduleWriter.
+    store[i] da acceso aleatorio al préstamo i a través del índice de offsets.
+    Las memoryview entregadas deben liberarse (o salir de alcance) antes de close().
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        magic, version, count, index_offset = FILE_HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path!r} no es un almacén de cronogramas válido.")
+        index = self._buffer[index_offset:index_offset + 8 * count]
+        self._index = memoryview(_read_array("Q", index)) if _SWAP else index.cast("Q")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> StoredLoan:
+        return StoredLoan(self._buffer, self._index[i])
+
+    def __iter__(self) -> Iterator[StoredLoan]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        if hasattr(self, "_index"):
+            self._index.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "ScheduleStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from ejercicio_1 import BankAccount, LoanFactory
+
+    cuenta = BankAccount(owner="Mauricio", balance=1500.0)
+    loans = [LoanFactory.create(k, cuenta, 0.03, 360) for k in ("alemán", "americano", "francés")]
+
+    path = os.path.join(tempfile.mkdtemp(), "cronogramas.bin")
+    write_summaries(path, (loan.summary(10_000.0) for loan in loans))
+    print(f"Archivo: {path} ({os.path.getsize(path)} bytes)")
+
+    with ScheduleStore(path) as store:
+        loan = store[2]                     # acceso aleatorio
+        print(loan)
+        payment = loan.column("payment")
+        print(f"Primeras cuotas: {list(payment[:3])}")
+        del payment
@@ -0,0 +1,201 @@
+#Benchmarks del subsistema de préstamos (ejercicio_1.py y ejercicio_1_es.py).
+#Barre estrategia x períodos (12 a 10.000) x tamaño de cartera y reporta
+#ns/fila, bloques de memoria retenidos y pico de memoria (tracemalloc).
+#Guarda una línea base en JSON y marca regresiones por encima de un umbral.
+#
+#Uso:
+#  python ejercicio_1_bench.py --save                 # mide y guarda la línea base
+#  python ejercicio_1_bench.py --compare              # mide y compara contra la línea base
+#  python ejercicio_1_bench.py --quick --threshold 0.4
+#
+#El tiempo de cada caso es la mediana de varias corridas (no el mínimo) y se compara
+#por llamada. Una regresión tiene que superar el umbral relativo, un mínimo absoluto
+#(--min-delta-ns) y la dispersión medida (máximo - mínimo de las corridas), y
+#repetirse cada vez que se vuelven a medir los casos marcados (--confirm veces).
+
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Tuple
+
+import ejercicio_1 as en
+import ejercicio_1_es as es
+from ejercicio_1_cartera import evaluate_portfolio
+
+PERIODS = (12, 120, 360, 1_200, 10_000)
+PORTFOLIO_SIZES = (1_000, 10_000, 100_000)
+QUICK_PERIODS = (12, 360)
+QUICK_PORTFOLIO_SIZES = (1_000,)
+RATE = 0.03
+PRINCIPAL = 10_000.0
+SEED = 1234
+
+
+@dataclass
+class Result:
+    name: str
+    rows: int          # filas (o préstamos) producidas por llamada; 1 para los casos O(1)
+    ns_per_call: float # mediana de las corridas
+    ns_per_row: float
+    blocks: int        # bloques de memoria retenidos por una llamada
+    peak_bytes: int    # pico de memoria durante una llamada
+    spread_ns: float = 0.0  # máximo - mínimo de las corridas, en ns por llamada
+
+
+def measure(name: str, fn: Callable[[], object], rows: int, repeat: int = 7) -> Result:
+    """Mediana (y dispersión) de `repeat` corridas (loops calibrados con autorange) + memoria de una llamada."""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    times = [t / loops * 1e9 for t in timer.repeat(repeat=repeat, number=loops)]
+    median = statistics.median(times)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    keep = fn()  # se retiene el resultado para contar lo que queda vivo
+    peak = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    del keep
+    return Result(name, rows, median, median / max(rows, 1), blocks, peak, max(times) - min(times))
+
+
+def _portfolio(size: int):
+    rnd = random.Random(SEED)
+    return (
+        [rnd.choice(("alemán", "americano", "francés")) for _ in range(size)],
+        [rnd.uniform(0, 50_000) for _ in range(size)],
+        [rnd.choice((0.01, 0.02, 0.03)) for _ in range(size)],
+        [rnd.choice((12, 24, 36, 360)) for _ in range(size)],
+        [rnd.uniform(1_000, 100_000) for _ in range(size)],
+    )
+
+
+@contextmanager
+def _uncached() -> Iterator[None]:
+    """Apaga las cachés de cronogramas y resúmenes (medir cálculo, no la caché) y las restaura."""
+    cache, en.Loan.schedule_cache = en.Loan.schedule_cache, None
+    cache_es, es.Prestamo.cache_cronogramas = es.Prestamo.cache_cronogramas, None
+    keep, en.Loan.keep_last_summary = en.Loan.keep_last_summary, False
+    keep_es, es.Prestamo.guardar_ultimo_resumen = es.Prestamo.guardar_ultimo_resumen, False
+    try:
+        yield
+    finally:
+        en.Loan.schedule_cache = cache
+        es.Prestamo.cache_cronogramas = cache_es
+        en.Loan.keep_last_summary = keep
+        es.Prestamo.guardar_ultimo_resumen = keep_es
+
+
+def cases(periods=PERIODS, portfolio_sizes=PORTFOLIO_SIZES) -> Iterator[Tuple[str, Callable[[], object], int]]:
+    """(nombre, función, filas por llamada) de cada caso del barrido."""
+    cuenta = en.BankAccount("bench", 1e9)
+    cuenta_es = es.CuentaBancaria("bench", 1e9)
+
+    yield "en.LoanFactory.create", lambda: en.LoanFactory.create("francés", cuenta, RATE, 12), 1
+    yield "es.FabricaPrestamos.crear", lambda: es.FabricaPrestamos.crear("francés", cuenta_es, RATE, 12), 1
+
+    for kind in ("alemán", "americano", "francés"):
+        for n in periods:
+            loan = en.LoanFactory.create(kind, cuenta, RATE, n)
+            prestamo = es.FabricaPrestamos.crear(kind, cuenta_es, RATE, n)
+            label = loan.strategy.name
+            yield f"en.build_schedule[{label},n={n}]", lambda: loan.build_schedule(PRINCIPAL), n
+            yield f"en.summary[{label},n={n}]", lambda: loan.summary(PRINCIPAL), n
+            # Fórmula cerrada: una "fila" por llamada, no n
+            yield (f"en.summary_totals[{label},n={n}]",
+                   lambda: loan.summary(PRINCIPAL, include_schedule=False), 1)
+            yield f"es.generar_cronograma[{label},n={n}]", lambda: prestamo.generar_cronograma(PRINCIPAL), n
+            yield f"es.resumen[{label},n={n}]", lambda: prestamo.resumen(PRINCIPAL), n
+
+    for size in portfolio_sizes:
+        book = _portfolio(size)
+        yield f"en.evaluate_portfolio[size={size}]", lambda: evaluate_portfolio(*book, max_workers=1), size
+
+
+def run_suite(periods=PERIODS, portfolio_sizes=PORTFOLIO_SIZES,
+              only: Optional[Collection[str]] = None) -> List[Result]:
+    """Mide todos los casos (o sólo los nombrados en only) con las cachés apagadas."""
+    with _uncached():
+        return [measure(name, fn, rows) for name, fn, rows in cases(periods, portfolio_sizes)
+                if only is None or name in only]
+
+
+def compare(results: List[Result], baseline: Dict[str, Dict], threshold: float,
+            min_delta_ns: float = 250.0) -> List[str]:
+    """
+    Nombres de los casos cuyo tiempo por llamada empeoró más que `threshold` (0.25 = 25 %),
+    más que min_delta_ns y más que la dispersión de la medición nueva o de la base.
+    """
+    regressions = []
+    for r in results:
+        base = baseline.get(r.name)
+        if not base:
+            continue
+        delta = r.ns_per_call - base["ns_per_call"]
+        noise = max(r.spread_ns, base.get("spread_ns", 0.0))
+        if delta > base["ns_per_call"] * threshold and delta > max(min_delta_ns, noise):
+            regressions.append(r.name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de ejercicio_1 y ejercicio_1_es.")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="archivo JSON de línea base")
+    parser.add_argument("--save", action="store_true", help="guardar los resultados como línea base")
+    parser.add_argument("--compare", action="store_true", help="comparar contra la línea base")
+    parser.add_argument("--threshold", type=float, default=0.25, help="regresión tolerada (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ns", type=float, default=250.0,
+                        help="empeoramiento mínimo por llamada para marcar una regresión")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="veces que se vuelven a medir los casos marcados antes de reportarlos")
+    parser.add_argument("--quick", action="store_true", help="barrido reducido")
+    args = parser.parse_args(argv)
+
+    sweep = (QUICK_PERIODS, QUICK_PORTFOLIO_SIZES) if args.quick else (PERIODS, PORTFOLIO_SIZES)
+    results = run_suite(*sweep)
+
+    print(f"{'caso':<44} {'ns/llamada':>14} {'ns/fila':>10} {'bloques':>8} {'pico KiB':>10}")
+    for r in results:
+        print(f"{r.name:<44} {r.ns_per_call:>14,.0f} {r.ns_per_row:>10,.1f} {r.blocks:>8} {r.peak_bytes / 1024:>10,.1f}")
+
+    status = 0
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ns)
+        again = results
+        for _ in range(args.confirm):
+            if not regressions:
+                break
+            # Se vuelven a medir sólo los casos marcados: una regresión real se repite, el ruido no.
+            again = run_suite(*sweep, only=set(regressions))
+            regressions = compare(again, baseline, args.threshold, args.min_delta_ns)
+        for name in regressions:
+            old, new = baseline[name]["ns_per_call"], next(r.ns_per_call for r in again if r.name == name)
+            print(f"REGRESIÓN {name}: {old:,.0f} -> {new:,.0f} ns/llamada")
+        status = 1 if regressions else 0
+        print("Sin regresiones." if not regressions else f"{len(regressions)} regresiones.")
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "results": [asdict(r) for r in results],
+            }, f, indent=2)
+        print(f"Línea base guardada en {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
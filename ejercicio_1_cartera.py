@@ -0,0 +1,587 @@
+#Cartera de préstamos: evaluación masiva sobre LoanFactory.
+#Agrupa los préstamos por estrategia (la instancia de cada clase de préstamo,
+#también las agregadas con LoanFactory.register), los evalúa por bloques (chunks)
+#con las fórmulas cerradas de RepaymentStrategy.totals y reparte los
+#bloques en un pool de procesos. El resultado es columnar (array('d')).
+
+from __future__ import annotations
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import isclose
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ejercicio_1 import BankAccount, Loan, LoanFactory, RepaymentStrategy, annual_rate, effective_rates
+
+# Perfil de un tipo de préstamo: (estrategia, multiplicador de aprobación). La estrategia
+# es la instancia misma (no su nombre), así que viaja a los procesos hijos por pickle.
+Profile = Tuple[RepaymentStrategy, float]
+
+# Códigos de motivo de approve_batch (REASONS[código] da el nombre)
+APPROVED = 0          # se aprueba todo lo pedido
+CAPPED = 1            # se aprueba menos de lo pedido (tope balance * multiplicador)
+NO_CAPACITY = 2       # el balance no permite prestar nada
+INVALID_REQUEST = 3   # monto pedido <= 0 (o nan)
+INVALID_BALANCE = 4   # balance negativo (o nan)
+UNKNOWN_KIND = 5      # etiqueta que LoanFactory no reconoce
+REASONS = ("approved", "capped", "no_capacity", "invalid_request", "invalid_balance", "unknown_kind")
+
+
+@dataclass
+class ChunkStats:
+    """Métricas de un bloque evaluado."""
+    strategy: str
+    size: int
+    seconds: float
+
+    @property
+    def loans_per_sec(self) -> float:
+        return self.size / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _prototype(kind: str) -> Loan:
+    # Un préstamo "prototipo" por tipo: la clase concreta fija estrategia y multiplicador.
+    return LoanFactory.create(kind, BankAccount("cartera"), interest_rate=0.0, periods=1)
+
+
+def _kind_profile(kind: str) -> Profile:
+    """(estrategia, multiplicador de aprobación) para una etiqueta del Factory."""
+    loan = _prototype(kind)
+    return loan.strategy, loan.approval_multiplier()
+
+
+def _group_by_profile(kinds: Sequence[str], profiles: Optional[Dict[str, Profile]] = None
+                      ) -> Dict[Profile, List[int]]:
+    """
+    Índices de la cartera agrupados por (estrategia, multiplicador). El perfil se arma
+    una vez por etiqueta distinta y queda en profiles (si se pasa) para reusarlo.
+    """
+    profiles = {} if profiles is None else profiles
+    groups: Dict[Profile, List[int]] = {}
+    for idx, kind in enumerate(kinds):
+        if kind not in profiles:
+            profiles[kind] = _kind_profile(kind)
+        groups.setdefault(profiles[kind], []).append(idx)
+    return groups
+
+
+def _evaluate_chunk(strategy: RepaymentStrategy, multiplier: float,
+                    balances: Sequence[float], rates: Sequence[float],
+                    periods: Sequence[int], requested: Sequence[float]
+                    ) -> Tuple[array, array, array, float]:
+    """Evalúa un bloque homogéneo (misma estrategia). Devuelve columnas + segundos."""
+    t0 = perf_counter()
+    totals = strategy.totals
+    approved = array("d", [min(r, b * multiplier) for b, r in zip(balances, requested)])
+    paid = array("d", bytes(8 * len(approved)))
+    interest = array("d", bytes(8 * len(approved)))
+    for j, (p, i, n) in enumerate(zip(approved, rates, periods)):
+        if p > 0:   # no financiable -> totales en 0
+            paid[j], interest[j] = totals(p, i, n)
+    return approved, paid, interest, perf_counter() - t0
+
+
+def evaluate_portfolio(kinds: Sequence[str], balances: Sequence[float],
+                       rates: Sequence[float], periods: Sequence[int],
+                       requested: Sequence[float], chunk_size: int = 50_000,
+                       max_workers: Optional[int] = None) -> Dict:
+    """
+    Evalúa una cartera completa dada en columnas (una entrada por préstamo).
+    Agrupa por estrategia, corta cada grupo en bloques de chunk_size y los
+    reparte en un ProcessPoolExecutor (max_workers=1 evalúa en este proceso).
+
+    Devuelve columnas en el orden de entrada (strategy, approved_principal,
+    total_paid, total_interest) y "chunks" con el throughput de cada bloque.
+    Un préstamo no financiable queda con approved_principal <= 0 y totales en 0.
+    Los bloques se copian recién cuando se evalúan: con el pool hay a lo sumo
+    2 * max_workers en vuelo, así que la memoria extra no crece con la cartera.
+
+    Da lo mismo que Loan.summary préstamo por préstamo:
+
+    >>> kinds = ["francés", "alemán", "americano", "francés", "alemán"]
+    >>> balances = [5_000.0, 800.0, 0.0, 2_000.0, 10_000.0]
+    >>> rates, periods = [0.03, 0.02, 0.01, 0.0, 0.025], [12, 24, 6, 12, 36]
+    >>> requested = [10_000.0, 1_000.0, 500.0, 4_000.0, 7_500.0]
+    >>> result = evaluate_portfolio(kinds, balances, rates, periods, requested, chunk_size=1, max_workers=2)
+    >>> result["strategy"], len(result["chunks"])
+    (['frances', 'aleman', 'americano', 'frances', 'aleman'], 5)
+    >>> def reference(kind, balance, rate, n, amount):
+    ...     loan = LoanFactory.create(kind, BankAccount("ref", balance), rate, n)
+    ...     if loan.max_principal_allowed() <= 0:
+    ...         return None
+    ...     return loan.summary(amount, include_schedule=False)
+    >>> all(info is None and result["total_paid"][j] == 0.0 or info is not None and
+    ...     isclose(info["approved_principal"], result["approved_principal"][j]) and
+    ...     isclose(info["total_paid"], result["total_paid"][j]) and
+    ...     isclose(info["total_interest"], result["total_interest"][j], abs_tol=1e-9)
+    ...     for j, info in enumerate(map(reference, kinds, balances, rates, periods, requested)))
+    True
+    """
+    n = len(kinds)
+    if not (len(balances) == len(rates) == len(periods) == len(requested) == n):
+        raise ValueError("Todas las columnas de la cartera deben tener el mismo largo.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size debe ser un entero positivo.")
+
+    # Mismas validaciones que Loan
+    for idx in range(n):
+        if not (0.0 <= rates[idx] < 1.0):
+            raise ValueError(f"interest_rate fuera de [0, 1) en el préstamo {idx}.")
+        if periods[idx] <= 0:
+            raise ValueError(f"periods debe ser positivo en el préstamo {idx}.")
+    groups = _group_by_profile(kinds)
+
+    def jobs() -> Iterator[Tuple[Tuple[str, List[int]], tuple]]:
+        # Cada bloque se copia recién cuando se evalúa (o entra al pool), no todos de entrada.
+        for (strategy, multiplier), idxs in groups.items():
+            for start in range(0, len(idxs), chunk_size):
+                part = idxs[start:start + chunk_size]
+                yield (strategy.name, part), (strategy, multiplier,
+                                              [balances[j] for j in part], [rates[j] for j in part],
+                                              [int(periods[j]) for j in part], [requested[j] for j in part])
+
+    pool = None
+    chunks = sum(-(-len(idxs) // chunk_size) for idxs in groups.values())
+    if max_workers == 1 or chunks <= 1:
+        outputs = ((label, _evaluate_chunk(*args)) for label, args in jobs())
+    else:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        outputs = _bounded_map(pool, _evaluate_chunk, jobs(), 2 * (max_workers or os.cpu_count() or 1))
+
+    strategy = [""] * n
+    approved = array("d", bytes(8 * n))
+    paid = array("d", bytes(8 * n))
+    interest = array("d", bytes(8 * n))
+    stats = []
+    try:
+        for (name, part), (ap, tp, ti, seconds) in outputs:
+            for k, j in enumerate(part):
+                strategy[j] = name
+                approved[j], paid[j], interest[j] = ap[k], tp[k], ti[k]
+            stats.append(ChunkStats(strategy=name, size=len(part), seconds=seconds))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        "strategy": strategy,
+        "approved_principal": approved,
+        "total_paid": paid,
+        "total_interest": interest,
+        "chunks": stats,
+    }
+
+
+def affordable_principals(kinds: Sequence[str], balances: Sequence[float], rates: Sequence[float],
+                          periods: Sequence[int], max_payments: Sequence[float]) -> array:
+    """
+    "¿Cuánto puede pedir cada cliente si su cuota no puede superar X?" para toda
+    una lista de clientes: resuelve por grupo de estrategia con la fórmula cerrada
+    de max_principal_for_payments y topea con el balance * multiplicador del tipo.
+    """
+    n = len(kinds)
+    if not (len(balances) == len(rates) == len(periods) == len(max_payments) == n):
+        raise ValueError("Todas las columnas deben tener el mismo largo.")
+
+    result = array("d", bytes(8 * n))
+    for (strategy, multiplier), idxs in _group_by_profile(kinds).items():
+        solved = strategy.max_principal_for_payments(
+            [max_payments[j] for j in idxs], [rates[j] for j in idxs], [int(periods[j]) for j in idxs])
+        for j, p in zip(idxs, solved):
+            result[j] = max(0.0, min(p, balances[j] * multiplier))
+    return result
+
+
+def approve_batch(balances: Sequence[float], requested: Sequence[float], kinds: Sequence[str]) -> Dict:
+    """
+    Etapa de aprobación en lote, sin excepciones por préstamo: aplica el
+    approval_multiplier de cada tipo (resuelto una vez por etiqueta distinta) y
+    devuelve columnas en el orden de entrada:
+      approved_principal: array('d') con min(pedido, balance * multiplicador), 0 si se rechaza
+      reason: array('b') con un código de REASONS por préstamo
+      reason_counts: {nombre del motivo: cantidad}
+    Un préstamo rechazado acá es exactamente uno para el que Loan.build_schedule
+    levantaría ValueError.
+
+    >>> balances = [1_000.0, 1_000.0, 0.0, 1_000.0, -5.0, 1_000.0]
+    >>> requested = [500.0, 1e6, 100.0, 0.0, 100.0, 100.0]
+    >>> kinds = ["francés", "alemán", "americano", "francés", "alemán", "cripto"]
+    >>> decision = approve_batch(balances, requested, kinds)
+    >>> [REASONS[code] for code in decision["reason"]]
+    ['approved', 'capped', 'no_capacity', 'invalid_request', 'invalid_balance', 'unknown_kind']
+    >>> decision["approved_principal"].tolist()
+    [500.0, 2000.0, 0.0, 0.0, 0.0, 0.0]
+    >>> def raises(balance, amount, kind):
+    ...     try:
+    ...         LoanFactory.create(kind, BankAccount("ref", max(balance, 0.0)), 0.03, 12).build_schedule(amount)
+    ...     except ValueError:
+    ...         return True
+    ...     return False
+    >>> [raises(*row) for row in zip(balances, requested, kinds)] == [p == 0 for p in decision["approved_principal"]]
+    True
+    """
+    n = len(kinds)
+    if not (len(balances) == len(requested) == n):
+        raise ValueError("Todas las columnas deben tener el mismo largo.")
+
+    multipliers: Dict[str, Optional[float]] = {}
+    for kind in set(kinds):
+        try:
+            multipliers[kind] = _kind_profile(kind)[1]
+        except ValueError:   # una vez por etiqueta desconocida, no por préstamo
+            multipliers[kind] = None
+
+    approved = array("d", bytes(8 * n))
+    reason = array("b", bytes(n))
+    for j, (balance, amount, kind) in enumerate(zip(balances, requested, kinds)):
+        multiplier = multipliers[kind]
+        if multiplier is None:
+            reason[j] = UNKNOWN_KIND
+        elif not amount > 0:
+            reason[j] = INVALID_REQUEST
+        elif not balance >= 0:
+            reason[j] = INVALID_BALANCE
+        else:
+            cap = balance * multiplier
+            if cap <= 0:
+                reason[j] = NO_CAPACITY
+            elif amount <= cap:
+                approved[j] = amount
+            else:
+                approved[j] = cap
+                reason[j] = CAPPED
+
+    counts = [0] * len(REASONS)
+    for code in reason:
+        counts[code] += 1
+    return {
+        "approved_principal": approved,
+        "reason": reason,
+        "reason_counts": {name: c for name, c in zip(REASONS, counts) if c},
+    }
+
+
+CASHFLOW_COLUMNS = ("payment", "interest", "amortization")
+
+
+def _aggregate_chunk(strategy: RepaymentStrategy, multiplier: float,
+                     balances: Sequence[float], rates: Sequence[float],
+                     periods: Sequence[int], requested: Sequence[float]) -> Dict[str, array]:
+    """
+    Flujos por período de un bloque homogéneo. Los cronogramas son lineales en el
+    capital, así que se suma el capital aprobado por (tasa, plazo) y se arma un solo
+    cronograma por producto, que se acumula (scatter-add) en los totales del bloque.
+    """
+    principal_by_product: Dict[Tuple[float, int], float] = {}
+    for b, i, n, r in zip(balances, rates, periods, requested):
+        p = min(r, b * multiplier)
+        if p > 0:
+            principal_by_product[(i, n)] = principal_by_product.get((i, n), 0.0) + p
+
+    horizon = max((n for _, n in principal_by_product), default=0)
+    out = {c: array("d", bytes(8 * horizon)) for c in CASHFLOW_COLUMNS}
+    for (i, n), principal in principal_by_product.items():
+        cols = strategy.build_columns(principal, i, n)
+        for c in CASHFLOW_COLUMNS:
+            acc, col = out[c], cols[c]
+            for k in range(n):
+                acc[k] += col[k]
+    return out
+
+
+def _bounded_map(pool: ProcessPoolExecutor, fn, jobs: Iterator[Tuple[object, tuple]],
+                 limit: int) -> Iterator[Tuple[object, object]]:
+    """(etiqueta, fn(*args)) de cada trabajo, en orden, con a lo sumo `limit` en vuelo."""
+    pending: deque = deque()
+    for label, args in jobs:
+        pending.append((label, pool.submit(fn, *args)))
+        if len(pending) >= limit:
+            label, future = pending.popleft()
+            yield label, future.result()
+    while pending:
+        label, future = pending.popleft()
+        yield label, future.result()
+
+
+def aggregate_cashflows(kinds: Sequence[str], balances: Sequence[float],
+                        rates: Sequence[float], periods: Sequence[int],
+                        requested: Sequence[float], by: Optional[str] = None,
+                        chunk_size: int = 50_000, max_workers: Optional[int] = 1
+                        ) -> Dict[str, Dict[str, array]]:
+    """
+    Flujo de caja esperado por período futuro (período 1 = posición 0) para toda la
+    cartera: pago, interés y amortización sumados sobre todos los préstamos.
+
+    by=None devuelve un solo grupo "total"; by="strategy" agrupa por estrategia y
+    by="type" por clase de préstamo (GermanLoan, ...). Se procesa en bloques de
+    chunk_size préstamos que se arman recién cuando se evalúan y, con max_workers != 1,
+    se reparten en un ProcessPoolExecutor con a lo sumo 2 * max_workers bloques en
+    vuelo: la memoria extra está acotada por chunk_size, no por la cartera.
+
+    Coincide con sumar, préstamo por préstamo, los cronogramas de Loan.build_schedule:
+
+    >>> from itertools import zip_longest
+    >>> kinds = ["francés", "alemán", "americano", "francés", "alemán", "francés"]
+    >>> balances = [5_000.0, 800.0, 0.0, 2_000.0, 10_000.0, 300.0]
+    >>> rates = [0.03, 0.02, 0.01, 0.03, 0.025, 0.0]
+    >>> periods = [12, 24, 6, 12, 36, 18]
+    >>> requested = [10_000.0, 1_000.0, 500.0, 4_000.0, 7_500.0, 900.0]
+    >>> def reference(label_of):
+    ...     out = {}
+    ...     for kind, balance, rate, n, amount in zip(kinds, balances, rates, periods, requested):
+    ...         loan = LoanFactory.create(kind, BankAccount("ref", balance), rate, n)
+    ...         acc = out.setdefault(label_of(loan), {c: [0.0] * max(periods) for c in CASHFLOW_COLUMNS})
+    ...         if loan.max_principal_allowed() <= 0:    # no financiable: el grupo queda, sin flujos
+    ...             continue
+    ...         for row in loan.build_schedule(amount):
+    ...             for c in CASHFLOW_COLUMNS:
+    ...                 acc[c][row.period - 1] += row[c]
+    ...     return out
+    >>> def matches(got, ref):
+    ...     return sorted(got) == sorted(ref) and all(
+    ...         isclose(a, b, abs_tol=1e-8) for label in ref for c in CASHFLOW_COLUMNS
+    ...         for a, b in zip_longest(got[label][c], ref[label][c], fillvalue=0.0))
+    >>> book = (kinds, balances, rates, periods, requested)
+    >>> matches(aggregate_cashflows(*book), reference(lambda loan: "total"))
+    True
+    >>> matches(aggregate_cashflows(*book, by="strategy"), reference(lambda loan: loan.strategy.name))
+    True
+    >>> matches(aggregate_cashflows(*book, by="type", chunk_size=1, max_workers=2),
+    ...         reference(lambda loan: type(loan).__name__))
+    True
+    """
+    if by not in (None, "strategy", "type"):
+        raise ValueError("by debe ser None, 'strategy' o 'type'.")
+    n = len(kinds)
+    if not (len(balances) == len(rates) == len(periods) == len(requested) == n):
+        raise ValueError("Todas las columnas de la cartera deben tener el mismo largo.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size debe ser un entero positivo.")
+
+    # Grupo = (etiqueta, estrategia, multiplicador): dos clases con el mismo perfil no se mezclan con by="type".
+    profiles: Dict[str, Profile] = {}
+    groups: Dict[Tuple[str, RepaymentStrategy, float], List[int]] = {}
+    for profile, idxs in _group_by_profile(kinds, profiles).items():
+        if by == "type":
+            classes = {kind: LoanFactory.resolve(kind).__name__ for kind, p in profiles.items() if p == profile}
+            for j in idxs:
+                groups.setdefault((classes[kinds[j]], *profile), []).append(j)
+        else:
+            label = "total" if by is None else profile[0].name
+            groups.setdefault((label, *profile), []).extend(idxs)
+
+    def jobs() -> Iterator[Tuple[str, tuple]]:
+        for (label, strategy, multiplier), idxs in groups.items():
+            for start in range(0, len(idxs), chunk_size):
+                part = idxs[start:start + chunk_size]
+                yield label, (strategy, multiplier,
+                              [balances[j] for j in part], [rates[j] for j in part],
+                              [int(periods[j]) for j in part], [requested[j] for j in part])
+
+    pool = None
+    chunks = sum(-(-len(idxs) // chunk_size) for idxs in groups.values())
+    if max_workers == 1 or chunks <= 1:
+        partials = ((label, _aggregate_chunk(*args)) for label, args in jobs())
+    else:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        partials = _bounded_map(pool, _aggregate_chunk, jobs(), 2 * (max_workers or os.cpu_count() or 1))
+
+    result: Dict[str, Dict[str, array]] = {}
+    try:
+        for label, partial in partials:
+            totals = result.setdefault(label, {c: array("d") for c in CASHFLOW_COLUMNS})
+            for c in CASHFLOW_COLUMNS:
+                acc, col = totals[c], partial[c]
+                if len(acc) < len(col):
+                    acc.extend(array("d", bytes(8 * (len(col) - len(acc)))))
+                for k, value in enumerate(col):
+                    acc[k] += value
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return result
+
+
+def _solve_costs_chunk(keys: Sequence[Tuple[RepaymentStrategy, float, int, float, float]], tol: float,
+                       max_iter: int) -> Tuple[array, array, array]:
+    """Arma los flujos normalizados (capital 1) de cada combinación y los resuelve en lote."""
+    payments, disbursements, guesses = [], [], []
+    for strategy, rate, term, upfront, periodic in keys:
+        flows = strategy.build_columns(1.0, rate, term)["payment"]
+        payments.append(array("d", [p + periodic for p in flows]) if periodic else flows)
+        disbursements.append(1.0 - upfront)
+        guesses.append(rate)
+    solved = effective_rates(payments, disbursements, guesses, tol=tol, max_iter=max_iter)
+    return solved.rates, solved.iterations, solved.converged
+
+
+def effective_costs(kinds: Sequence[str], balances: Sequence[float], rates: Sequence[float],
+                    periods: Sequence[int], requested: Sequence[float],
+                    upfront_fees: Optional[Sequence[float]] = None,
+                    periodic_fees: Optional[Sequence[float]] = None,
+                    periods_per_year: int = 12, tol: float = 1e-12, max_iter: int = 50,
+                    chunk_size: int = 20_000, max_workers: Optional[int] = 1) -> Dict:
+    """
+    CFT (TIR de los flujos) de toda la cartera con un Newton en lote (effective_rates).
+    Los flujos son lineales en el capital: normalizados por el capital aprobado, dos
+    préstamos con la misma (estrategia, tasa, plazo, gastos/capital) tienen el mismo
+    CFT, así que se resuelve una vez por combinación distinta. Con gastos fijos
+    (que no escalan con el capital) casi no hay repetidas: las combinaciones se
+    cortan en bloques de chunk_size y, con max_workers != 1, van a un ProcessPoolExecutor.
+
+    Devuelve columnas en el orden de entrada: periodic_rate, annual_rate (nan si el
+    préstamo no es financiable o no convergió), iterations y converged, más "solved"
+    (cantidad de sistemas resueltos) y "failed" (índices que no convergieron).
+    """
+    n = len(kinds)
+    if not (len(balances) == len(rates) == len(periods) == len(requested) == n):
+        raise ValueError("Todas las columnas de la cartera deben tener el mismo largo.")
+    upfront_fees = upfront_fees if upfront_fees is not None else [0.0] * n
+    periodic_fees = periodic_fees if periodic_fees is not None else [0.0] * n
+    if not (len(upfront_fees) == len(periodic_fees) == n):
+        raise ValueError("Los gastos deben tener una entrada por préstamo.")
+
+    # Combinaciones distintas de flujos normalizados (capital 1)
+    keys: Dict[Tuple, int] = {}
+    owner = [-1] * n
+    for (strategy, multiplier), idxs in _group_by_profile(kinds).items():
+        for j in idxs:
+            approved = min(requested[j], balances[j] * multiplier)
+            if approved <= 0 or not (0.0 <= upfront_fees[j] < approved) or periodic_fees[j] < 0:
+                continue
+            key = (strategy, rates[j], int(periods[j]), upfront_fees[j] / approved, periodic_fees[j] / approved)
+            owner[j] = keys.setdefault(key, len(keys))
+
+    unique = list(keys)
+    chunks = [unique[start:start + chunk_size] for start in range(0, len(unique), chunk_size)]
+    if max_workers == 1 or len(chunks) <= 1:
+        outputs = [_solve_costs_chunk(chunk, tol, max_iter) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            outputs = list(pool.map(_solve_costs_chunk, chunks, [tol] * len(chunks), [max_iter] * len(chunks)))
+    rates_by_key, iterations_by_key, converged_by_key = array("d"), array("q"), array("b")
+    for r, it, ok in outputs:
+        rates_by_key.extend(r)
+        iterations_by_key.extend(it)
+        converged_by_key.extend(ok)
+
+    nan = float("nan")
+    periodic_rate = array("d", [rates_by_key[k] if k >= 0 else nan for k in owner])
+    return {
+        "periodic_rate": periodic_rate,
+        "annual_rate": array("d", [annual_rate(r, periods_per_year) for r in periodic_rate]),
+        "iterations": array("q", [iterations_by_key[k] if k >= 0 else 0 for k in owner]),
+        "converged": array("b", [converged_by_key[k] if k >= 0 else 0 for k in owner]),
+        "solved": len(unique),
+        "failed": [j for j, k in enumerate(owner) if k >= 0 and not converged_by_key[k]],
+    }
+
+
+@dataclass
+class SensitivityGrid:
+    """
+    Matrices tasa x plazo para una estrategia: installment[r][t] es la cuota más
+    alta y total_interest[r][t] el interés total, con rates[r] y terms[t] como etiquetas.
+    """
+    strategy: str
+    principal: float
+    rates: array
+    terms: array
+    installment: List[array]
+    total_interest: List[array]
+
+    def lookup(self, rate: float, term: int) -> Tuple[float, float]:
+        """(cuota, interés total) de una celda por sus etiquetas."""
+        r = min(range(len(self.rates)), key=lambda k: abs(self.rates[k] - rate))
+        if not isclose(self.rates[r], rate, rel_tol=1e-9, abs_tol=1e-12):
+            raise ValueError(f"La tasa {rate} no está en la grilla.")
+        t = list(self.terms).index(term)
+        return self.installment[r][t], self.total_interest[r][t]
+
+
+def sensitivity_grid(rates: Sequence[float], terms: Sequence[int], principal: float = 1.0,
+                     kinds: Optional[Sequence[str]] = None) -> Dict[str, SensitivityGrid]:
+    """
+    Grilla de sensibilidad tasa x plazo por estrategia (una por clase de LoanFactory.REGISTRY,
+    o por las etiquetas de kinds), con el nombre de la estrategia como clave. Cada celda sale
+    de fórmulas cerradas en O(1) (cuota = P / max_principal_for_payment(1), interés = totals),
+    sin crear Loan ni cronogramas. ValueError si dos estrategias distintas comparten nombre.
+    """
+    for rate in rates:
+        if not (0.0 <= rate < 1.0):
+            raise ValueError("Las tasas deben estar en [0, 1).")
+    if any(term <= 0 for term in terms):
+        raise ValueError("Los plazos deben ser enteros positivos.")
+
+    strategies: Dict[str, RepaymentStrategy] = {}
+    for kind in (kinds if kinds is not None else LoanFactory.REGISTRY):
+        strategy = _kind_profile(kind)[0]
+        known = strategies.setdefault(strategy.name, strategy)
+        if type(known) is not type(strategy):
+            raise ValueError(f"Dos estrategias distintas se llaman {strategy.name!r}; pase kinds= sin ambigüedad.")
+    grids = {}
+    for name, strategy in sorted(strategies.items()):
+        unit_principal, totals = strategy.max_principal_for_payment, strategy.totals
+        grids[name] = SensitivityGrid(
+            strategy=name,
+            principal=principal,
+            rates=array("d", rates),
+            terms=array("q", terms),
+            installment=[array("d", [principal / unit_principal(1.0, i, n) for n in terms]) for i in rates],
+            total_interest=[array("d", [totals(principal, i, n)[1] for n in terms]) for i in rates],
+        )
+    return grids
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    import random
+
+    rnd = random.Random(42)
+    size = 200_000
+    kinds = [rnd.choice(("alemán", "americano", "francés")) for _ in range(size)]
+    balances = [rnd.uniform(0, 50_000) for _ in range(size)]
+    rates = [rnd.choice((0.01, 0.02, 0.03)) for _ in range(size)]
+    periods = [rnd.choice((12, 24, 36, 360)) for _ in range(size)]
+    requested = [rnd.uniform(1_000, 100_000) for _ in range(size)]
+
+    t0 = perf_counter()
+    result = evaluate_portfolio(kinds, balances, rates, periods, requested, chunk_size=25_000)
+    dt = perf_counter() - t0
+    print(f"{size} préstamos en {dt:.3f} s ({size / dt:,.0f} préstamos/s)")
+    print(f"Total a cobrar: {sum(result['total_paid']):,.2f}")
+    for c in result["chunks"]:
+        print(f"  {c.strategy:<10} {c.size:>7} préstamos  {c.loans_per_sec:,.0f}/s")
+
+    # Aprobación en lote (sin try/except por préstamo), con algunos rechazos
+    book_balances = [0.0 if k % 4 == 0 else b for k, b in enumerate(balances)]
+    t0 = perf_counter()
+    decision = approve_batch(book_balances, requested, kinds)
+    print(f"Aprobación de {size} solicitudes en {perf_counter() - t0:.3f} s: {decision['reason_counts']}")
+
+    # Flujo de caja esperado por período, por estrategia
+    t0 = perf_counter()
+    flows = aggregate_cashflows(kinds, balances, rates, periods, requested, by="strategy", max_workers=None)
+    print(f"Flujos por período en {perf_counter() - t0:.3f} s")
+    for label, cols in sorted(flows.items()):
+        print(f"  {label:<10} período 1: cobro={cols['payment'][0]:,.2f} | período 12: cobro={cols['payment'][11]:,.2f}")
+
+    # CFT con gastos (1,5% al inicio + 20 por cuota) para los primeros 20.000 préstamos
+    t0 = perf_counter()
+    m = 20_000
+    cft = effective_costs(kinds[:m], balances[:m], rates[:m], periods[:m], requested[:m],
+                          upfront_fees=[0.015 * r for r in requested[:m]], periodic_fees=[20.0] * m,
+                          max_workers=None)
+    print(f"CFT de {m} préstamos ({cft['solved']} sistemas) en {perf_counter() - t0:.3f} s, "
+          f"sin converger: {len(cft['failed'])} | CFT anual del primero: {cft['annual_rate'][0]:.2%}")
+
+    # Grilla 200 tasas x 120 plazos para cada producto
+    t0 = perf_counter()
+    grids = sensitivity_grid([k / 2_000 for k in range(1, 201)], range(1, 121), principal=10_000.0)
+    print(f"Grillas 200x120 x {len(grids)} estrategias en {(perf_counter() - t0) * 1000:.1f} ms")
+    print(f"Francés 3% a 12 meses: cuota={grids['frances'].lookup(0.03, 12)[0]:.2f}")
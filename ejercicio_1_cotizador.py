@@ -0,0 +1,257 @@
+#Servicio de cotización asyncio (sólo stdlib) sobre LoanFactory + Loan.summary.
+#Protocolo: una línea JSON por pedido y una línea JSON por respuesta (TCP).
+#  {"kind": "francés", "balance": 1500, "rate": 0.03, "periods": 12, "requested": 10000}
+#  {"op": "stats"}
+#- Coalescing: pedidos idénticos concurrentes comparten un único cálculo.
+#- Micro-batching: pedidos distintos se juntan durante batch_window segundos
+#  (o hasta max_batch) y se calculan juntos con evaluate_portfolio.
+#- Métricas: latencia p50/p99, profundidad de cola, pedidos coalescidos y lotes.
+
+from __future__ import annotations
+import asyncio
+import json
+from collections import deque
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from ejercicio_1 import BankAccount, LoanFactory, normalize_kind
+from ejercicio_1_cartera import evaluate_portfolio
+
+QuoteKey = Tuple[str, float, float, int, float]   # (kind, balance, rate, periods, requested)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class QuoteServer:
+    """
+    Cotizador con coalescing de pedidos idénticos y micro-lotes de pedidos distintos.
+
+    >>> params = {"kind": "francés", "balance": 5_000.0, "rate": 0.03, "periods": 12, "requested": 1_000.0}
+    >>> async def burst():
+    ...     server = QuoteServer()
+    ...     quotes = await asyncio.gather(server.quote(params), server.quote(dict(params, kind="Frances")),
+    ...                                   server.quote(dict(params, periods=24)))
+    ...     await server.close()
+    ...     return quotes[0] == quotes[1], quotes[0] == quotes[2], server.stats()
+    >>> same, different, stats = asyncio.run(burst())
+    >>> same, different, stats["requests"], stats["coalesced"], stats["batches"]
+    (True, False, 3, 1, 1)
+
+    close() responde con error a los pedidos que seguían esperando:
+
+    >>> async def closing():
+    ...     server = QuoteServer(batch_window=60.0)    # el lote no se despacha antes del close
+    ...     pending = asyncio.gather(server.quote(params), server.quote(params), return_exceptions=True)
+    ...     await asyncio.sleep(0)
+    ...     await server.close()
+    ...     errors = await asyncio.wait_for(pending, 1)
+    ...     return [type(e).__name__ for e in errors], server.stats()["inflight"]
+    >>> asyncio.run(closing())
+    (['RuntimeError', 'RuntimeError'], 0)
+    """
+
+    def __init__(self, batch_window: float = 0.002, max_batch: int = 1024, latency_window: int = 10_000) -> None:
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._inflight: Dict[QuoteKey, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._latencies = deque(maxlen=latency_window)
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    # --- Núcleo ---
+    @staticmethod
+    def _key(params: Dict) -> QuoteKey:
+        """
+        Valida igual que LoanFactory/Loan (ValueError si algo no cierra) y normaliza la clave:
+        el tipo va en su forma canónica, así "Francés" y "frances" se coalescen.
+        """
+        kind = str(params["kind"])
+        balance, rate = float(params["balance"]), float(params["rate"])
+        periods, requested = int(params["periods"]), float(params["requested"])
+        LoanFactory.create(kind, BankAccount("cotizador", balance), rate, periods)
+        return normalize_kind(kind), balance, rate, periods, requested
+
+    async def quote(self, params: Dict) -> Dict:
+        """Cotiza un pedido (totales de Loan.summary sin cronograma)."""
+        t0 = perf_counter()
+        self.requests += 1
+        try:
+            key = self._key(params)
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                self._ensure_batcher()
+                self._queue.put_nowait(key)
+            else:
+                self.coalesced += 1
+            # shield: si un cliente se cae no se cancela el cálculo compartido
+            return await asyncio.shield(future)
+        finally:
+            self._latencies.append(perf_counter() - t0)
+
+    def _ensure_batcher(self) -> None:
+        if self._batcher is None or self._batcher.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._batcher = asyncio.get_running_loop().create_task(self._run_batches())
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            keys = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(keys) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    keys.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            try:
+                # El cálculo (CPU) corre en un hilo para no frenar el event loop.
+                results = await loop.run_in_executor(None, self._compute, keys)
+            except Exception as exc:   # no debería pasar: los pedidos ya se validaron
+                results = [exc] * len(keys)
+            for key, result in zip(keys, results):
+                future = self._inflight.pop(key)
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    @staticmethod
+    def _compute(keys: List[QuoteKey]) -> List[object]:
+        kinds, balances, rates, periods, requested = (list(col) for col in zip(*keys))
+        out = evaluate_portfolio(kinds, balances, rates, periods, requested, max_workers=1)
+        results: List[object] = []
+        for j, key in enumerate(keys):
+            approved = out["approved_principal"][j]
+            if approved <= 0:
+                results.append(ValueError("El principal solicitado no es financiable (verifique el balance)."))
+                continue
+            results.append({
+                "kind": key[0],
+                "strategy": out["strategy"][j],
+                "approved_principal": approved,
+                "periods": key[3],
+                "interest_rate": key[2],
+                "total_paid": out["total_paid"][j],
+                "total_interest": out["total_interest"][j],
+            })
+        return results
+
+    def stats(self) -> Dict:
+        latencies = list(self._latencies)
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "inflight": len(self._inflight),
+            "p50_ms": _percentile(latencies, 0.50) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000,
+        }
+
+    # --- TCP ---
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        pending = set()
+        lock = asyncio.Lock()
+
+        async def answer(line: bytes) -> None:
+            params = None
+            try:
+                params = json.loads(line)
+                if not isinstance(params, dict):
+                    raise ValueError("Cada pedido debe ser un objeto JSON.")
+                if params.get("op") == "stats":
+                    response = {"ok": True, "stats": self.stats()}
+                else:
+                    response = {"ok": True, "quote": await self.quote(params)}
+            except KeyError as e:
+                response = {"ok": False, "error": f"Falta el campo {e.args[0]!r}."}
+            except (ValueError, TypeError, OverflowError) as e:   # OverflowError: p. ej. "periods": 1e400
+                response = {"ok": False, "error": str(e)}
+            except Exception as e:   # cualquier otro error también se responde: el pedido no queda colgado
+                response = {"ok": False, "error": f"Error interno: {type(e).__name__}: {e}"}
+            if isinstance(params, dict) and "id" in params:
+                response["id"] = params["id"]
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                # Cada línea se atiende en su propia tarea: un cliente puede tener varios pedidos en vuelo.
+                task = asyncio.create_task(answer(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Levanta el servidor. Devuelve (host, puerto) reales (port=0 elige uno libre)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """Cierra el servidor y el batcher; los pedidos sin responder reciben RuntimeError."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        # Sin batcher nadie resolvería estos futures: quote() quedaría esperando para siempre.
+        for future in self._inflight.values():
+            if not future.done():
+                future.set_exception(RuntimeError("El cotizador se cerró antes de responder."))
+        self._inflight.clear()
+        self._queue = None
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    import random
+
+    async def client(host: str, port: int, requests: List[Dict]) -> List[Dict]:
+        reader, writer = await asyncio.open_connection(host, port)
+        for k, params in enumerate(requests):
+            writer.write(json.dumps({**params, "id": k}).encode() + b"\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        return responses
+
+    async def main() -> None:
+        server = QuoteServer()
+        host, port = await server.start()
+        rnd = random.Random(0)
+        # Pocos productos muy repetidos (coalescing) + algunos distintos (micro-lotes)
+        products = [{"kind": k, "balance": 1500.0, "rate": r, "periods": n, "requested": 10_000.0}
+                    for k in ("alemán", "americano", "francés") for r in (0.02, 0.03) for n in (12, 24, 36)]
+        bursts = [[rnd.choice(products) for _ in range(200)] for _ in range(20)]
+        responses = await asyncio.gather(*(client(host, port, b) for b in bursts))
+        print(f"Respuestas: {sum(len(r) for r in responses)} | ejemplo: {responses[0][0]['quote']}")
+        print(f"Métricas: {server.stats()}")
+        await server.close()
+
+    asyncio.run(main())
@@ -5,13 +5,20 @@
 
 from __future__ import annotations  # Permite referirse a clases no definidas. Ej usar el objeto Nodo en la clase Nodo.
 from abc import ABC, abstractmethod  # Para definir clases y métodos abstractos (interfaces)
-from typing import List, Dict  # Tipado de listas y diccionarios #List[Dict]:
+from array import array  # Columnas del modo columnar
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union  # Tipado
+
+from ejercicio_1 import (  # Núcleo de amortización compartido con la versión en inglés
+    COLUMNS, AmericanStrategy, Columns, FrenchStrategy, GermanStrategy, KindAliases, RepaymentStrategy,
+    Schedule, ScheduleCache, broadcast_columns, normalize_kind,
+)
 
 # =======================================
 # 1) Cuenta bancaria con @property + setter
 # =======================================
 class CuentaBancaria:
     """Cuenta bancaria simple con balance protegido, depósito y extracción."""
+    _version = 0  # Aumenta con cada cambio de saldo (los préstamos la usan para invalidar su último resumen)
 
     def __init__(self, titular_cuenta: str, saldo_inicial: float = 0.0) -> None:
         self._titular = titular_cuenta  # Atributo protegido
@@ -22,6 +29,10 @@ class CuentaBancaria:
     def titular(self) -> str:
         return self._titular  # Getter del titular
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     @property
     def saldo(self) -> float:
         """Saldo disponible. No puede ser negativo."""
@@ -33,6 +44,7 @@ class CuentaBancaria:
         if valor < 0:
             raise ValueError("El saldo no puede ser negativo.")
         self._saldo = float(valor)
+        self._version += 1
 
     def depositar(self, monto: float) -> None:
         # Método para depositar dinero, valida que sea positivo
@@ -40,6 +52,7 @@ class CuentaBancaria:
             if monto <= 0:
                 raise ValueError("El depósito debe ser mayor a cero.")
             self._saldo += float(monto)
+            self._version += 1
         except ValueError as e:
             print(e)
 
@@ -51,6 +64,7 @@ class CuentaBancaria:
             if monto > self._saldo:
                 raise ValueError("Fondos insuficientes.")
             self._saldo -= float(monto)
+            self._version += 1
         except ValueError as e:
             print(e)
 
@@ -61,115 +75,162 @@ class CuentaBancaria:
 # ========================================
 # 2) Estrategias de amortización (Strategy)
 # ========================================
+# Las cuentas viven en el núcleo compartido de ejercicio_1.py: cada estrategia en
+# castellano delega en su RepaymentStrategy (modo columnar, totales en O(1),
+# streaming y caché), así cada optimización se hace una sola vez.
+
+class FilaCronograma(NamedTuple):
+    """Fila del cronograma con nombres en castellano (mismo orden que COLUMNS del núcleo)."""
+    periodo: int
+    pago: float
+    interes: float
+    amortizacion: float
+    restante: float
+
+    def __getitem__(self, clave):
+        if isinstance(clave, str):
+            if clave not in self._fields:
+                raise KeyError(clave)  # como con los dicts de antes
+            return getattr(self, clave)  # fila["pago"]
+        return tuple.__getitem__(self, clave)
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._fields  # "pago" in fila, como con los dicts de antes
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
 
 class EstrategiaAmortizacion(ABC):
-    """Estrategia para generar cronograma de pagos."""
+    """
+    Estrategia para generar cronograma de pagos (fachada sobre el núcleo).
+    Da exactamente los mismos números que la estrategia en inglés:
+
+    >>> from ejercicio_1 import FrenchStrategy
+    >>> es = EstrategiaFrancesa().generar_cronograma(10_000, 0.03, 12)
+    >>> en = FrenchStrategy().build_schedule(10_000, 0.03, 12)
+    >>> all(tuple(f) == tuple(r) for f, r in zip(es, en))
+    True
+    >>> es[0]["pago"] == en[0]["payment"]
+    True
+
+    Una estrategia propia con el contrato anterior (filas dict) itera las mismas filas:
+
+    >>> class Cuotas(EstrategiaAmortizacion):
+    ...     nombre = "cuotas"
+    ...     def generar_cronograma(self, capital, tasa, periodos):
+    ...         return [{"periodo": k, "pago": capital / periodos, "interes": 0.0,
+    ...                  "amortizacion": capital / periodos, "restante": capital - k * capital / periodos}
+    ...                 for k in range(1, periodos + 1)]
+    >>> fila = next(Cuotas().iterar_cronograma(1_200, 0.0, 12))
+    >>> type(fila).__name__, fila["pago"], fila.restante
+    ('FilaCronograma', 100.0, 1100.0)
+    """
 
     nombre: str  # Nombre de la estrategia
-
-    @abstractmethod
-    def generar_cronograma(self, capital: float, tasa: float, periodos: int) -> List[Dict]:
-        # Método abstracto a implementar en subclases
-        pass
+    # Estrategia del núcleo compartido (una instancia por clase). Una estrategia propia
+    # puede no tenerla y sobrescribir generar_cronograma, como antes: el resto de los
+    # métodos se arma a partir de ese cronograma.
+    nucleo: Optional[RepaymentStrategy] = None
+
+    def __new__(cls, *args, **kwargs):
+        # La base sola es abstracta (como cuando generar_cronograma era @abstractmethod)
+        if cls is EstrategiaAmortizacion:
+            raise TypeError("EstrategiaAmortizacion es abstracta: use una estrategia concreta.")
+        return super().__new__(cls)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        # Sin nucleo ni generar_cronograma propio no hay cronograma: falla al definir la clase
+        super().__init_subclass__(**kwargs)
+        if cls.nucleo is None and cls.generar_cronograma is EstrategiaAmortizacion.generar_cronograma:
+            raise TypeError(f"{cls.__name__} debe definir nucleo o implementar generar_cronograma.")
+
+    def generar_columnas(self, capital: float, tasa: float, periodos: int) -> Columns:
+        # Modo columnar del núcleo (claves period, payment, interest, amortization, remaining)
+        if self.nucleo is None:
+            filas = self.generar_cronograma(capital, tasa, periodos)
+            return {c: array("q" if c == "period" else "d", [fila[k] for fila in filas])
+                    for c, k in zip(COLUMNS, FilaCronograma._fields)}
+        return self.nucleo.build_columns(capital, tasa, periodos)
+
+    def generar_cronograma(self, capital: float, tasa: float, periodos: int) -> Schedule:
+        if self.nucleo is None:
+            raise NotImplementedError(f"{type(self).__name__} debe definir nucleo o implementar generar_cronograma.")
+        return Schedule(self.nucleo.build_columns(capital, tasa, periodos), FilaCronograma)
+
+    def iterar_cronograma(self, capital: float, tasa: float, periodos: int) -> Iterator[FilaCronograma]:
+        # Streaming: filas de a una, en memoria constante
+        if self.nucleo is None:
+            # Estrategia propia: sus filas (dicts, p. ej.) pasan por las columnas, así también son FilaCronograma
+            return iter(Schedule(self.generar_columnas(capital, tasa, periodos), FilaCronograma))
+        return map(FilaCronograma._make, self.nucleo.iter_schedule(capital, tasa, periodos))
+
+    def totales(self, capital: float, tasa: float, periodos: int) -> Tuple[float, float]:
+        # (total_pagado, interes_total) con la fórmula cerrada del núcleo
+        if self.nucleo is None:
+            filas = self.generar_cronograma(capital, tasa, periodos)
+            return sum(f["pago"] for f in filas), sum(f["interes"] for f in filas)
+        return self.nucleo.totals(capital, tasa, periodos)
 
 # ---------- Alemana ----------
 class EstrategiaAlemana(EstrategiaAmortizacion):
     nombre = "alemana"
-
-    def generar_cronograma(self, capital: float, tasa: float, periodos: int) -> List[Dict]:
-        cronograma = []
-        saldo = capital
-        amortizacion = capital / periodos  # Amortización fija
-        for t in range(1, periodos + 1):
-            interes = saldo * tasa
-            pago = interes + amortizacion
-            saldo = max(0.0, saldo - amortizacion)
-            cronograma.append({
-                "periodo": t,
-                "pago": pago,
-                "interes": interes,
-                "amortizacion": amortizacion,
-                "restante": saldo
-            })
-        return cronograma #"este es un cronograma propio de una estrategia de credio aleman"
+    nucleo = GermanStrategy()
 
 # ---------- Americana ----------
 class EstrategiaAmericana(EstrategiaAmortizacion):
     nombre = "americana"
-
-    def generar_cronograma(self, capital: float, tasa: float, periodos: int) -> List[Dict]:
-        cronograma = []
-        interes_periodico = capital * tasa  # Solo se pagan intereses hasta el último período
-        for t in range(1, periodos):
-            cronograma.append({
-                "periodo": t,
-                "pago": interes_periodico,
-                "interes": interes_periodico,
-                "amortizacion": 0.0,
-                "restante": capital
-            })
-        cronograma.append({
-            "periodo": periodos,
-            "pago": interes_periodico + capital,
-            "interes": interes_periodico,
-            "amortizacion": capital,
-            "restante": 0.0
-        })
-        return cronograma
+    nucleo = AmericanStrategy()
 
 # ---------- Francesa ----------
 class EstrategiaFrancesa(EstrategiaAmortizacion):
     nombre = "francesa"
-
-    def generar_cronograma(self, capital: float, tasa: float, periodos: int) -> List[Dict]:
-        cronograma = []
-        i = tasa
-        if i == 0:
-            # Si tasa es cero, amortización fija
-            amort = capital / periodos
-            saldo = capital
-            for t in range(1, periodos + 1):
-                pago = amort #cuota fija
-                saldo = max(0.0, saldo - amort)
-                cronograma.append({
-                    "periodo": t,
-                    "pago": pago,
-                    "interes": 0.0,
-                    "amortizacion": amort,
-                    "restante": saldo
-                })
-            return cronograma
-
-        # Cuota constante según fórmula de anualidad
-        anualidad = capital * i / (1 - (1 + i) ** (-periodos))
-        saldo = capital
-        for t in range(1, periodos + 1):
-            interes = saldo * i
-            amortizacion = anualidad - interes
-            saldo = max(0.0, saldo - amortizacion)
-            cronograma.append({
-                "periodo": t,
-                "pago": anualidad,
-                "interes": interes,
-                "amortizacion": amortizacion,
-                "restante": saldo
-            })
-        return cronograma
+    nucleo = FrenchStrategy()
 
 # =======================================
 # 3) Clase base Prestamo con propiedades
 # =======================================
 class Prestamo(ABC):
-    def __init__(self, cuenta: CuentaBancaria, tasa: float, periodos: int, estrategia: EstrategiaAmortizacion) -> None:
-        # Constructor base, recibe cuenta, tasa, plazos y estrategia
+    """
+    Préstamo genérico (fachada en castellano de Loan). Mismos resultados que ejercicio_1:
+
+    >>> from ejercicio_1 import BankAccount, LoanFactory
+    >>> es = FabricaPrestamos.crear("alemán", CuentaBancaria("Ana", 1500.0), 0.03, 12).resumen(10_000)
+    >>> en = LoanFactory.create("alemán", BankAccount("Ana", 1500.0), 0.03, 12).summary(10_000)
+    >>> (es["total_pagado"], es["interes_total"]) == (en["total_paid"], en["total_interest"])
+    True
+    >>> list(es["cronograma"]) == list(en["schedule"])
+    True
+    """
+    # Caché de cronogramas (la misma ScheduleCache del núcleo; None la desactiva)
+    cache_cronogramas: Optional[ScheduleCache] = ScheduleCache()
+    # Estrategia compartida por todas las instancias de la clase (flyweight, sin estado)
+    ESTRATEGIA: Optional[EstrategiaAmortizacion] = None
+    # Último resumen: se reusa mientras no cambie el capital aprobado (False lo desactiva)
+    guardar_ultimo_resumen: bool = True
+    _ultimo_resumen: Optional[Tuple] = None  # (clave, versión de la cuenta, capital aprobado, resumen)
+
+    def __init__(self, cuenta: CuentaBancaria, tasa: float, periodos: int,
+                 estrategia: Optional[EstrategiaAmortizacion] = None) -> None:
+        # Constructor base, recibe cuenta, tasa, plazos y (opcional) estrategia
         self._cuenta = cuenta
         self._tasa = 0.0
         self._periodos = 0
-        self.estrategia = estrategia
+        self.estrategia = estrategia if estrategia is not None else self.ESTRATEGIA
 
         self.tasa = tasa         # Setter con validación
         self.periodos = periodos # Setter con validación
 
+    @classmethod
+    def _desde_validados(cls, cuenta: CuentaBancaria, tasa: float, periodos: int) -> "Prestamo":
+        # Constructor sin setters para lotes ya validados (FabricaPrestamos.crear_varios)
+        prestamo = cls.__new__(cls)
+        prestamo._cuenta = cuenta
+        prestamo._tasa = tasa
+        prestamo._periodos = periodos
+        prestamo.estrategia = cls.ESTRATEGIA
+        return prestamo
+
     @property
     def cuenta(self) -> CuentaBancaria:
         return self._cuenta
@@ -203,19 +264,58 @@ class Prestamo(ABC):
         # Devuelve cuánto puede pedir según el saldo
         return self.cuenta.saldo * self.multiplicador_aprobacion()
 
-    def generar_cronograma(self, capital_solicitado: float) -> List[Dict]:
-        # Genera el plan de pagos, respetando el capital máximo
+    def _capital_financiable(self, capital_solicitado: float) -> float:
+        # Respeta el capital máximo; error si no queda nada para prestar
         capital = min(capital_solicitado, self.capital_maximo())
         if capital <= 0:
             raise ValueError("Capital solicitado no financiable.")
-        return self.estrategia.generar_cronograma(capital, self.tasa, self.periodos)
-
-    def resumen(self, capital_solicitado: float) -> Dict:
-        # Devuelve un resumen con el cronograma y totales
-        cronograma = self.generar_cronograma(capital_solicitado)
-        total_pagado = sum(fila["pago"] for fila in cronograma)
-        total_interes = sum(fila["interes"] for fila in cronograma)
-        return {
+        return capital
+
+    def generar_cronograma(self, capital_solicitado: float) -> Schedule:
+        # Genera el plan de pagos, respetando el capital máximo. Siempre es un Schedule armado
+        # desde las columnas (inmutable aunque la estrategia devuelva dicts), con o sin caché.
+        capital = self._capital_financiable(capital_solicitado)
+
+        def armar() -> Schedule:
+            return Schedule(self.estrategia.generar_columnas(capital, self.tasa, self.periodos), FilaCronograma)
+
+        if self.cache_cronogramas is None:
+            return armar()
+        # Clave por instancia: estrategias de la misma clase configuradas distinto no se mezclan.
+        return self.cache_cronogramas.get_or_build((self.estrategia, capital, self.tasa, self.periodos), armar)
+
+    def iterar_cronograma(self, capital_solicitado: float) -> Iterator[FilaCronograma]:
+        # Plan de pagos fila por fila (memoria constante)
+        capital = self._capital_financiable(capital_solicitado)
+        return self.estrategia.iterar_cronograma(capital, self.tasa, self.periodos)
+
+    def totales(self, capital_solicitado: float) -> Tuple[float, float]:
+        # (total_pagado, interes_total) sin armar el cronograma
+        capital = self._capital_financiable(capital_solicitado)
+        return self.estrategia.totales(capital, self.tasa, self.periodos)
+
+    def resumen(self, capital_solicitado: float, incluir_cronograma: bool = True) -> Dict:
+        # Devuelve un resumen con los totales (fórmula cerrada) y, si se pide, el cronograma.
+        # Reusa el último si la cuenta no cambió o si el cambio no mueve el capital aprobado.
+        if not self.guardar_ultimo_resumen:
+            return self._resumen(capital_solicitado, incluir_cronograma)
+        clave = (capital_solicitado, incluir_cronograma, self.tasa, self.periodos, self.estrategia)
+        version = self.cuenta.version
+        ultimo = self._ultimo_resumen
+        if ultimo is not None and ultimo[0] == clave:
+            if ultimo[1] == version:
+                return dict(ultimo[3])
+            aprobado = min(capital_solicitado, self.capital_maximo())
+            if aprobado == ultimo[2]:
+                self._ultimo_resumen = (clave, version, aprobado, ultimo[3])
+                return dict(ultimo[3])
+        info = self._resumen(capital_solicitado, incluir_cronograma)
+        self._ultimo_resumen = (clave, version, info["capital_aprobado"], info)
+        return dict(info)
+
+    def _resumen(self, capital_solicitado: float, incluir_cronograma: bool) -> Dict:
+        total_pagado, total_interes = self.totales(capital_solicitado)
+        info = {
             "tipo": type(self).__name__,
             "estrategia": self.estrategia.nombre,
             "capital_aprobado": min(capital_solicitado, self.capital_maximo()),
@@ -223,30 +323,28 @@ class Prestamo(ABC):
             "tasa": self.tasa,
             "total_pagado": total_pagado,
             "interes_total": total_interes,
-            "cronograma": cronograma
         }
+        if incluir_cronograma:
+            info["cronograma"] = self.generar_cronograma(capital_solicitado)
+        return info
 
 # ===================================================
 # 4) Clases específicas de préstamo (herencia real)
 # ===================================================
 class PrestamoAleman(Prestamo):
-    def __init__(self, cuenta: CuentaBancaria, tasa: float, periodos: int) -> None:
-        # Se pasa directamente la estrategia alemana
-        super().__init__(cuenta, tasa, periodos, estrategia=EstrategiaAlemana())
+    ESTRATEGIA = EstrategiaAlemana()  # Una sola instancia para todos los préstamos alemanes
 
     def multiplicador_aprobacion(self) -> float:
         return 2.0  # Puede pedir hasta 2x el saldo
 
 class PrestamoAmericano(Prestamo):
-    def __init__(self, cuenta: CuentaBancaria, tasa: float, periodos: int) -> None:
-        super().__init__(cuenta, tasa, periodos, estrategia=EstrategiaAmericana())
+    ESTRATEGIA = EstrategiaAmericana()
 
     def multiplicador_aprobacion(self) -> float:
         return 1.5  # Puede pedir hasta 1.5x el saldo
 
 class PrestamoFrances(Prestamo):
-    def __init__(self, cuenta: CuentaBancaria, tasa: float, periodos: int) -> None:
-        super().__init__(cuenta, tasa, periodos, estrategia=EstrategiaFrancesa())
+    ESTRATEGIA = EstrategiaFrancesa()
 
     def multiplicador_aprobacion(self) -> float:
         return 3.0  # Puede pedir hasta 3x el saldo
@@ -263,14 +361,51 @@ class FabricaPrestamos:
         "frances": PrestamoFrances,
         "francés": PrestamoFrances
     }
+    # Tabla de alias prearmada (acentos, mayúsculas y espacios no importan)
+    _alias = KindAliases(REGISTRO)
+
+    @classmethod
+    def registrar(cls, tipo: str, clase: type) -> None:
+        # Agrega un tipo y rearma la tabla de alias
+        cls.REGISTRO[tipo] = clase
+        cls._alias = KindAliases(cls.REGISTRO)
+
+    @classmethod
+    def resolver(cls, tipo: str) -> type:
+        # Clase de préstamo para una etiqueta (ValueError si no existe)
+        clase = cls._alias.resolve(tipo)
+        if clase is None:
+            raise ValueError(f"Tipo desconocido: {normalize_kind(tipo)!r}. Opciones válidas: {', '.join(cls.REGISTRO)}")
+        return clase
 
     @classmethod
     def crear(cls, tipo: str, cuenta: CuentaBancaria, tasa: float, periodos: int) -> Prestamo:
         # Método de clase que crea un préstamo según el tipo
-        tipo = tipo.strip().lower()
-        if tipo not in cls.REGISTRO:
-            raise ValueError(f"Tipo desconocido: {tipo!r}. Opciones válidas: {', '.join(cls.REGISTRO)}")
-        return cls.REGISTRO[tipo](cuenta, tasa, periodos)
+        return cls.resolver(tipo)(cuenta, tasa, periodos)
+
+    @classmethod
+    def crear_varios(cls, tipos: Union[str, Sequence[str]], cuentas: Union[CuentaBancaria, Sequence[CuentaBancaria]],
+                     tasas: Union[float, Sequence[float]], periodos: Union[int, Sequence[int]]) -> List[Prestamo]:
+        # Lote de préstamos (un escalar vale para todo el lote). Valida una vez por lote:
+        # cada tipo distinto se resuelve una vez y tasas/plazos se chequean en una pasada.
+        n, (tipos, cuentas, tasas, periodos) = broadcast_columns(tipos, cuentas, tasas, periodos)
+        clases = {tipo: cls.resolver(tipo) for tipo in set(tipos)}
+        tasas = [float(t) for t in tasas]
+        periodos = [int(p) for p in periodos]
+        for idx in range(n):
+            if not (0.0 <= tasas[idx] < 1.0):
+                raise ValueError(f"La tasa debe estar entre 0 y 1 (préstamo {idx}).")
+            if periodos[idx] <= 0:
+                raise ValueError(f"Los períodos deben ser mayores a cero (préstamo {idx}).")
+
+        prestamos = []
+        for tipo, cuenta, tasa, plazo in zip(tipos, cuentas, tasas, periodos):
+            clase = clases[tipo]
+            if clase.ESTRATEGIA is not None and clase.__init__ is Prestamo.__init__:
+                prestamos.append(clase._desde_validados(cuenta, tasa, plazo))
+            else:  # clases registradas con su propio __init__
+                prestamos.append(clase(cuenta, tasa, plazo))
+        return prestamos
 
 # ============================
 # 6) Ejemplo de uso manual
@@ -0,0 +1,195 @@
+#Libro mayor concurrente para BankAccount.
+#Locks por franjas (lock striping): cada cuenta cae en una de N franjas,
+#así hilos que operan cuentas distintas no se bloquean entre sí.
+#Las operaciones devuelven resultados estructurados (TxResult) en vez de print().
+
+from __future__ import annotations
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+from ejercicio_1 import BankAccount
+
+DEPOSIT = "deposit"
+WITHDRAW = "withdraw"
+
+# Códigos de rechazo
+INVALID_AMOUNT = "invalid_amount"          # monto <= 0
+INSUFFICIENT_FUNDS = "insufficient_funds"
+UNKNOWN_ACCOUNT = "unknown_account"
+UNKNOWN_KIND = "unknown_kind"
+ABORTED = "aborted"                        # lote atómico cancelado por otro rechazo
+
+
+@dataclass(frozen=True)
+class Transaction:
+    account_id: str
+    kind: str          # DEPOSIT | WITHDRAW
+    amount: float
+
+
+@dataclass(frozen=True)
+class TxResult:
+    index: int                   # posición dentro del lote
+    ok: bool
+    error: Optional[str] = None  # código de rechazo si ok es False
+    balance: float = 0.0         # balance de la cuenta luego de procesar la transacción
+
+
+class Ledger:
+    """Registro thread-safe de cuentas con depósitos/extracciones individuales o por lotes."""
+
+    def __init__(self, stripes: int = 64) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes debe ser un entero positivo.")
+        self._locks = [Lock() for _ in range(stripes)]
+        self._accounts: Dict[str, BankAccount] = {}
+        self._registry_lock = Lock()
+
+    def open(self, account: BankAccount, account_id: Optional[str] = None) -> str:
+        """Registra una cuenta (por defecto con su owner como id). Devuelve el id."""
+        account_id = account.owner if account_id is None else account_id
+        with self._registry_lock:
+            if account_id in self._accounts:
+                raise ValueError(f"La cuenta {account_id!r} ya está registrada.")
+            self._accounts[account_id] = account
+        return account_id
+
+    def account(self, account_id: str) -> BankAccount:
+        return self._accounts[account_id]
+
+    def _stripe(self, account_id: str) -> int:
+        return hash(account_id) % len(self._locks)
+
+    def balance(self, account_id: str) -> float:
+        with self._locks[self._stripe(account_id)]:
+            return self._accounts[account_id].balance
+
+    # --- Operaciones individuales ---
+    def deposit(self, account_id: str, amount: float) -> TxResult:
+        return self.apply_transactions([Transaction(account_id, DEPOSIT, amount)])[0]
+
+    def withdraw(self, account_id: str, amount: float) -> TxResult:
+        return self.apply_transactions([Transaction(account_id, WITHDRAW, amount)])[0]
+
+    # --- Lotes ---
+    def _validate(self, tx: Transaction) -> Optional[str]:
+        if tx.kind not in (DEPOSIT, WITHDRAW):
+            return UNKNOWN_KIND
+        if not tx.amount > 0:
+            return INVALID_AMOUNT
+        if tx.account_id not in self._accounts:
+            return UNKNOWN_ACCOUNT
+        return None
+
+    def apply_transactions(self, transactions: Iterable[Transaction], atomic: bool = False) -> List[TxResult]:
+        """
+        Aplica un lote en orden. Primero valida todo el lote sin tomar locks
+        (tipo, monto, cuenta); después toma una sola vez las franjas involucradas
+        (en orden, para evitar deadlocks) y comitea.
+        Con atomic=True, si alguna transacción se rechaza no se aplica ninguna.
+
+        >>> ledger = Ledger(stripes=4)
+        >>> ana, beto = ledger.open(BankAccount("ana", 100.0)), ledger.open(BankAccount("beto"))
+
+        Los fondos se chequean contra los movimientos anteriores del mismo lote:
+
+        >>> batch = [Transaction(beto, DEPOSIT, 50.0), Transaction(beto, WITHDRAW, 80.0),
+        ...          Transaction(beto, WITHDRAW, 50.0)]
+        >>> [(r.ok, r.error, r.balance) for r in ledger.apply_transactions(batch)]
+        [(True, None, 50.0), (False, 'insufficient_funds', 50.0), (True, None, 0.0)]
+
+        Cuenta, tipo o monto inválidos se rechazan sin tocar el resto del lote:
+
+        >>> batch = [Transaction("nadie", DEPOSIT, 1.0), Transaction(ana, "transfer", 1.0),
+        ...          Transaction(ana, WITHDRAW, -5.0), Transaction(ana, DEPOSIT, 10.0)]
+        >>> [r.error for r in ledger.apply_transactions(batch)], ledger.balance(ana)
+        (['unknown_account', 'unknown_kind', 'invalid_amount', None], 110.0)
+
+        Con atomic=True un rechazo cancela el lote entero (ABORTED para las demás):
+
+        >>> batch = [Transaction(ana, WITHDRAW, 30.0), Transaction(beto, WITHDRAW, 1.0)]
+        >>> [(r.ok, r.error, r.balance) for r in ledger.apply_transactions(batch, atomic=True)]
+        [(False, 'aborted', 110.0), (False, 'insufficient_funds', 0.0)]
+        >>> ledger.balance(ana), ledger.balance(beto)
+        (110.0, 0.0)
+
+        Lotes concurrentes sobre las mismas cuentas no pierden actualizaciones:
+
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> batch = [Transaction(ana, DEPOSIT, 1.0), Transaction(beto, DEPOSIT, 2.0),
+        ...          Transaction(ana, WITHDRAW, 0.5)]
+        >>> with ThreadPoolExecutor(max_workers=8) as pool:
+        ...     results = [r for rs in pool.map(ledger.apply_transactions, [batch] * 2_000) for r in rs]
+        >>> all(r.ok for r in results), ledger.balance(ana), ledger.balance(beto)
+        (True, 1110.0, 4000.0)
+        """
+        txs = list(transactions)
+        errors = [self._validate(tx) for tx in txs]
+        stripes = sorted({self._stripe(tx.account_id) for tx, err in zip(txs, errors) if err != UNKNOWN_ACCOUNT})
+
+        for s in stripes:
+            self._locks[s].acquire()
+        try:
+            # Los fondos se chequean contra balances tentativos (un depósito previo del lote cuenta).
+            pending: Dict[str, float] = {}
+            after = [0.0] * len(txs)
+            for k, (tx, err) in enumerate(zip(txs, errors)):
+                if err == UNKNOWN_ACCOUNT:
+                    continue
+                current = pending.get(tx.account_id, self._accounts[tx.account_id]._balance)
+                if err is not None:
+                    after[k] = current
+                    continue
+                if tx.kind == WITHDRAW:
+                    if tx.amount > current:
+                        errors[k] = INSUFFICIENT_FUNDS
+                        after[k] = current
+                        continue
+                    current -= float(tx.amount)
+                else:
+                    current += float(tx.amount)
+                pending[tx.account_id] = after[k] = current
+
+            if atomic and any(err is not None for err in errors):
+                return [TxResult(k, False, err or ABORTED, self._accounts[tx.account_id]._balance
+                                 if tx.account_id in self._accounts else 0.0)
+                        for k, (tx, err) in enumerate(zip(txs, errors))]
+
+            # Commit único: se escribe el balance final de cada cuenta tocada.
+            for account_id, balance in pending.items():
+                account = self._accounts[account_id]
+                account._balance = balance
+                account._version += 1   # invalida los resúmenes de sus Loan
+            return [TxResult(k, err is None, err, after[k]) for k, err in enumerate(errors)]
+        finally:
+            for s in reversed(stripes):
+                self._locks[s].release()
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from time import perf_counter
+
+    ledger = Ledger()
+    ids = [ledger.open(BankAccount(owner=f"cliente-{n}", balance=1000.0)) for n in range(1000)]
+
+    rnd = random.Random(7)
+    batches = [[Transaction(rnd.choice(ids), rnd.choice((DEPOSIT, WITHDRAW)), rnd.uniform(-10, 500))
+                for _ in range(1000)] for _ in range(100)]
+
+    t0 = perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = [r for batch in pool.map(ledger.apply_transactions, batches) for r in batch]
+    dt = perf_counter() - t0
+
+    rejected: Dict[str, int] = {}
+    for r in results:
+        if not r.ok:
+            rejected[r.error] = rejected.get(r.error, 0) + 1
+    print(f"{len(results)} transacciones en {dt:.3f} s ({len(results) / dt:,.0f} tx/s)")
+    print(f"Rechazadas: {rejected}")
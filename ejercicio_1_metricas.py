@@ -0,0 +1,243 @@
+#Instrumentación opt-in de los caminos calientes de ejercicio_1.
+#enable() envuelve LoanFactory.create, Loan.max_principal_allowed (aprobación),
+#Loan.build_schedule y Loan.summary, y además build_columns y totals de cada
+#RepaymentStrategy (la base y todas las subclases definidas al momento de
+#enable(), con la métrica a nombre de la clase concreta: "FrenchStrategy.totals").
+#disable() restaura los métodos originales, así que apagada no cuesta nada.
+#Registra llamadas, errores, tiempo acumulado, percentiles de latencia y filas
+#generadas (sólo las que arma la estrategia: un acierto de la caché de cronogramas
+#no genera filas). Las llamadas que lanzan excepción, p. ej. el ValueError de un
+#pedido rechazado, también cuentan su tiempo. Exportables como dict o como texto Prometheus.
+
+from __future__ import annotations
+from collections import deque
+from functools import wraps
+from threading import Lock
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Tuple
+
+from ejercicio_1 import Loan, LoanFactory, RepaymentStrategy
+
+# (clase, método, nombre de la métrica)
+TARGETS: List[Tuple[type, str, str]] = [
+    (LoanFactory, "create", "LoanFactory.create"),
+    (Loan, "max_principal_allowed", "Loan.max_principal_allowed"),
+    (Loan, "build_schedule", "Loan.build_schedule"),
+    (Loan, "summary", "Loan.summary"),
+]
+# Métodos de RepaymentStrategy que arman cronogramas (el trabajo real detrás de la caché).
+# build_columns es el que usa Loan.build_schedule; la base lo arma desde build_schedule
+# para las estrategias del contrato anterior, así que también quedan medidas.
+STRATEGY_METHODS: Tuple[str, ...] = ("build_columns", "totals")
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _rows(columns) -> int:
+    """Filas generadas por un build_columns (0 si la llamada falló)."""
+    return len(columns["period"]) if columns is not None else 0
+
+
+def _strategy_classes() -> List[type]:
+    """RepaymentStrategy y todas sus subclases (a cualquier profundidad)."""
+    found, pending = [], [RepaymentStrategy]
+    while pending:
+        cls = pending.pop()
+        found.append(cls)
+        pending.extend(cls.__subclasses__())
+    return found
+
+
+def _quantile(ordered: List[int], q: float) -> int:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0
+
+
+class _Stat:
+    __slots__ = ("calls", "errors", "total_ns", "rows", "samples")
+
+    def __init__(self, sample_size: int) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.rows = 0
+        self.samples = deque(maxlen=sample_size)   # últimas latencias, para percentiles
+
+
+class Instrumentation:
+    """
+    Métricas de los caminos calientes. Apagada por defecto.
+
+    >>> from ejercicio_1 import BankAccount, FrenchLoan
+    >>> metrics = Instrumentation()
+    >>> metrics.enable()
+    >>> loan = FrenchLoan(BankAccount("Ana", 5_000.0), 0.03, 12)
+    >>> _ = loan.summary(1_234.5)
+    >>> _ = loan.build_schedule(1_234.5)      # acierto de la caché: no arma filas
+    >>> metrics.disable()
+    >>> snap = metrics.snapshot()
+    >>> snap["FrenchStrategy.totals"]["calls"]
+    1
+    >>> snap["FrenchStrategy.build_columns"]["calls"], snap["FrenchStrategy.build_columns"]["rows"]
+    (1, 12)
+    >>> snap["Loan.build_schedule"]["calls"], snap["Loan.build_schedule"]["rows"]
+    (2, 0)
+    """
+
+    def __init__(self, sample_size: int = 10_000) -> None:
+        self._sample_size = sample_size
+        self._stats: Dict[str, _Stat] = {}
+        self._lock = Lock()
+        self._originals: Dict[Tuple[type, str], object] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def record(self, name: str, elapsed_ns: int, rows: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                stat = self._stats[name] = _Stat(self._sample_size)
+            stat.calls += 1
+            stat.errors += error
+            stat.total_ns += elapsed_ns
+            stat.rows += rows
+            stat.samples.append(elapsed_ns)
+
+    def _wrap(self, fn: Callable, name: str) -> Callable:
+        record = self.record
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            result, error = None, True
+            t0 = perf_counter_ns()
+            try:
+                result = fn(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                record(name, perf_counter_ns() - t0, 0, error)
+        return timed
+
+    def _wrap_strategy(self, fn: Callable, attr: str) -> Callable:
+        # La métrica va a nombre de la clase concreta (self), aunque el método sea heredado.
+        record = self.record
+        rows = _rows if attr == "build_columns" else None
+
+        @wraps(fn)
+        def timed(strategy, *args, **kwargs):
+            result, error = None, True
+            t0 = perf_counter_ns()
+            try:
+                result = fn(strategy, *args, **kwargs)
+                error = False
+                return result
+            finally:
+                record(f"{type(strategy).__name__}.{attr}", perf_counter_ns() - t0,
+                       rows(result) if rows is not None else 0, error)
+        return timed
+
+    def enable(self) -> None:
+        """Instala los envoltorios (idempotente)."""
+        if self.enabled:
+            return
+        for cls, attr, name in TARGETS:
+            original = cls.__dict__[attr]
+            self._originals[(cls, attr)] = original
+            if isinstance(original, classmethod):
+                setattr(cls, attr, classmethod(self._wrap(original.__func__, name)))
+            else:
+                setattr(cls, attr, self._wrap(original, name))
+        for cls in _strategy_classes():
+            for attr in STRATEGY_METHODS:
+                original = cls.__dict__.get(attr)
+                if original is not None:
+                    self._originals[(cls, attr)] = original
+                    setattr(cls, attr, self._wrap_strategy(original, attr))
+
+    def disable(self) -> None:
+        """Restaura los métodos originales: costo cero mientras está apagada."""
+        for (cls, attr), original in self._originals.items():
+            setattr(cls, attr, original)
+        self._originals.clear()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Métricas como dict plano: {operación: {calls, errors, total_ms, rows, p50_us, ...}}."""
+        with self._lock:
+            items = [(name, stat.calls, stat.errors, stat.total_ns, stat.rows, sorted(stat.samples))
+                     for name, stat in self._stats.items()]
+        out = {}
+        for name, calls, errors, total_ns, rows, ordered in items:
+            entry = {"calls": calls, "errors": errors, "total_ms": total_ns / 1e6, "rows": rows}
+            for q in QUANTILES:
+                entry[f"p{int(q * 100)}_us"] = _quantile(ordered, q) / 1e3
+            out[name] = entry
+        return out
+
+    def prometheus(self, prefix: str = "loan_") -> str:
+        """Snapshot en formato de exposición de texto de Prometheus."""
+        snap = self.snapshot()
+        lines = [
+            f"# HELP {prefix}calls_total Llamadas por operación.",
+            f"# TYPE {prefix}calls_total counter",
+        ]
+        lines += [f'{prefix}calls_total{{op="{op}"}} {m["calls"]}' for op, m in snap.items()]
+        lines += [
+            f"# HELP {prefix}errors_total Llamadas que terminaron en excepción.",
+            f"# TYPE {prefix}errors_total counter",
+        ]
+        lines += [f'{prefix}errors_total{{op="{op}"}} {m["errors"]}' for op, m in snap.items()]
+        lines += [
+            f"# HELP {prefix}seconds_total Tiempo acumulado por operación.",
+            f"# TYPE {prefix}seconds_total counter",
+        ]
+        lines += [f'{prefix}seconds_total{{op="{op}"}} {m["total_ms"] / 1e3:.9f}' for op, m in snap.items()]
+        lines += [
+            f"# HELP {prefix}rows_total Filas de cronograma generadas.",
+            f"# TYPE {prefix}rows_total counter",
+        ]
+        lines += [f'{prefix}rows_total{{op="{op}"}} {m["rows"]}' for op, m in snap.items()]
+        lines += [
+            f"# HELP {prefix}latency_seconds Latencia por operación (últimas muestras).",
+            f"# TYPE {prefix}latency_seconds summary",
+        ]
+        for op, m in snap.items():
+            for q in QUANTILES:
+                lines.append(f'{prefix}latency_seconds{{op="{op}",quantile="{q}"}} {m[f"p{int(q * 100)}_us"] / 1e6:.9f}')
+            lines.append(f'{prefix}latency_seconds_sum{{op="{op}"}} {m["total_ms"] / 1e3:.9f}')
+            lines.append(f'{prefix}latency_seconds_count{{op="{op}"}} {m["calls"]}')
+        return "\n".join(lines) + "\n"
+
+
+# Instancia global y atajos
+INSTRUMENTATION = Instrumentation()
+enable = INSTRUMENTATION.enable
+disable = INSTRUMENTATION.disable
+reset = INSTRUMENTATION.reset
+snapshot = INSTRUMENTATION.snapshot
+prometheus = INSTRUMENTATION.prometheus
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    from ejercicio_1 import BankAccount
+
+    cuenta = BankAccount(owner="Mauricio", balance=1500.0)
+    enable()
+    for n in (12, 24, 360):
+        for kind in ("alemán", "americano", "francés"):
+            LoanFactory.create(kind, cuenta, 0.03, n).summary(10_000.0)
+    try:
+        LoanFactory.create("francés", BankAccount("Sin saldo"), 0.03, 12).build_schedule(10_000.0)
+    except ValueError:
+        pass   # rechazado: igual queda contado en calls/errors y en la latencia
+    disable()
+    for op, m in snapshot().items():
+        print(f"{op:<36} {m}")
+    print(prometheus())
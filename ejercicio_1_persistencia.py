@@ -0,0 +1,433 @@
+#Persistencia de cuentas (BankAccount / CuentaBancaria): WAL binario + snapshots.
+#- WAL append-only: cada depósito/extracción aceptado se agrega como un registro
+#  fijo con el balance resultante (la reproducción es idempotente, sin revalidar).
+#- Group commit: los registros se acumulan en memoria y se escriben como un marco
+#  [largo, crc32, registros...] con un solo fsync para todos los que esperaban.
+#- Snapshots compactos: balances float64 contiguos + titulares separados por NUL;
+#  al tomarlo se arranca un WAL nuevo y se borran los anteriores.
+#- Restauración: mmap del último snapshot + reproducción sólo de la cola del WAL.
+#  Un marco incompleto o corrupto al final (caída a mitad de escritura) se descarta.
+#- Los balances viven en un array('d') (la fuente de verdad); los objetos de cuenta
+#  se crean recién cuando se piden, así restaurar millones de cuentas no arma millones
+#  de objetos.
+#
+#Archivos en el directorio: snapshot-<gen>.bin (estado al inicio de wal-<gen>.log).
+
+from __future__ import annotations
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ejercicio_1 import BankAccount
+from ejercicio_1_es import CuentaBancaria
+
+MAGIC = b"ACCS"
+VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sHxxQQ")   # magic, versión, generación, cantidad de cuentas
+                                              # + balances float64 + titulares UTF-8 separados por NUL
+FRAME_HEADER = struct.Struct("<II")           # largo del marco, crc32
+OPEN_RECORD = struct.Struct("<BxxxIdH")       # OPEN, slot, balance inicial, largo del nombre (+ nombre)
+TX_RECORD = struct.Struct("<BxxxIdd")         # DEPOSIT|WITHDRAW, slot, monto, balance resultante
+
+OPEN, DEPOSIT, WITHDRAW = 0, 1, 2
+
+# Atributos (titular, balance) de cada tipo de cuenta soportado
+ACCOUNT_FIELDS: Dict[type, Tuple[str, str]] = {
+    BankAccount: ("_owner", "_balance"),
+    CuentaBancaria: ("_titular", "_saldo"),
+}
+
+
+def _fields(account_type: type) -> Tuple[str, str]:
+    for cls in account_type.__mro__:
+        if cls in ACCOUNT_FIELDS:
+            return ACCOUNT_FIELDS[cls]
+    raise ValueError(f"Tipo de cuenta no soportado: {account_type.__name__}.")
+
+
+def _snapshot_path(directory: str, gen: int) -> str:
+    return os.path.join(directory, f"snapshot-{gen:08d}.bin")
+
+
+def _wal_path(directory: str, gen: int) -> str:
+    return os.path.join(directory, f"wal-{gen:08d}.log")
+
+
+def _generations(directory: str, prefix: str, suffix: str) -> List[int]:
+    gens = []
+    for name in os.listdir(directory):
+        digits = name[len(prefix):-len(suffix)]
+        if name.startswith(prefix) and name.endswith(suffix) and digits.isdigit():
+            gens.append(int(digits))
+    return sorted(gens)
+
+
+def _frames(data: memoryview) -> Iterator[Tuple[int, memoryview]]:
+    """Marcos válidos del WAL: (offset del final, payload). Corta en el primer marco roto."""
+    pos = 0
+    while pos + FRAME_HEADER.size <= len(data):
+        length, crc = FRAME_HEADER.unpack_from(data, pos)
+        start, end = pos + FRAME_HEADER.size, pos + FRAME_HEADER.size + length
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            return
+        yield end, data[start:end]
+        pos = end
+
+
+class AccountStore:
+    """
+    Cuentas persistentes en `directory`. Si el directorio ya tiene datos, se restauran.
+    Las operaciones deben hacerse a través del store (no con account.deposit directo)
+    para quedar en el WAL; el store mantiene al día las cuentas que entregó.
+
+    group_size: registros por marco antes de un commit automático.
+    snapshot_every: registros de WAL que disparan un snapshot automático (None = nunca).
+    fsync: False sólo para pruebas/demos (pierde durabilidad ante caídas del SO).
+
+    Restauración desde el último snapshot más la cola del WAL:
+
+    >>> import tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> with AccountStore(directory, fsync=False) as store:
+    ...     _ = store.open("ana", 100.0)
+    ...     _ = store.snapshot()
+    ...     _ = store.deposit("ana", 50.0)
+    ...     _ = store.withdraw("ana", 30.0)
+    >>> with AccountStore(directory, fsync=False) as store:
+    ...     store.balance("ana"), store.restore_stats["generation"], store.restore_stats["replayed_records"]
+    (120.0, 1, 2)
+
+    Un marco cortado al final (caída a mitad de escritura) se descarta y el WAL
+    se trunca hasta el último marco válido:
+
+    >>> with AccountStore(directory, fsync=False) as store:
+    ...     _ = store.deposit("ana", 5.0, durable=True)
+    ...     _ = store.deposit("ana", 7.0, durable=True)
+    >>> wal = _wal_path(directory, 1)
+    >>> size = os.path.getsize(wal)
+    >>> with open(wal, "r+b") as f:
+    ...     _ = f.truncate(size - 3)
+    >>> with AccountStore(directory, fsync=False) as store:
+    ...     store.balance("ana")
+    125.0
+    >>> os.path.getsize(wal) == size - FRAME_HEADER.size - TX_RECORD.size
+    True
+
+    Lo mismo con un marco corrupto (crc32 distinto); lo que se agrega después queda detrás de lo válido:
+
+    >>> with AccountStore(directory, fsync=False) as store:
+    ...     _ = store.deposit("ana", 1000.0, durable=True)
+    >>> with open(wal, "r+b") as f:
+    ...     _ = f.seek(-1, os.SEEK_END)
+    ...     _ = f.write(bytes([0xFF]))
+    >>> with AccountStore(directory, fsync=False) as store:
+    ...     store.balance("ana"), store.deposit("ana", 1.0)
+    (125.0, 126.0)
+    >>> with AccountStore(directory, fsync=False) as store:
+    ...     store.balance("ana")
+    126.0
+    """
+
+    def __init__(self, directory: str, account_type: type = BankAccount, group_size: int = 512,
+                 snapshot_every: Optional[int] = 1_000_000, fsync: bool = True) -> None:
+        if group_size <= 0:
+            raise ValueError("group_size debe ser un entero positivo.")
+        self.directory = directory
+        self.account_type = account_type
+        self._owner_attr, self._balance_attr = _fields(account_type)
+        self.group_size = group_size
+        self.snapshot_every = snapshot_every
+        self._fsync = fsync
+
+        self._balances = array("d")                # slot -> balance
+        self._owners: List[str] = []               # slot -> titular
+        self._slots: Dict[str, int] = {}           # titular -> slot
+        self._accounts: Dict[int, object] = {}     # cuentas ya entregadas por account()
+
+        self._lock = Lock()        # estado + buffer del WAL
+        self._io_lock = Lock()     # escritura/fsync del WAL y snapshots (siempre antes que _lock)
+        self._buffer = bytearray()
+        self._pending = 0
+        self._seq = 0              # registros agregados
+        self._durable = 0          # registros ya en disco
+        self._since_snapshot = 0
+
+        os.makedirs(directory, exist_ok=True)
+        t0 = perf_counter()
+        self._generation, replayed = self._restore()
+        self.restore_stats = {
+            "generation": self._generation,
+            "accounts": len(self._owners),
+            "replayed_records": replayed,
+            "seconds": perf_counter() - t0,
+        }
+        self._wal = open(_wal_path(directory, self._generation), "ab")
+
+    # --- Restauración ---
+    def _restore(self) -> Tuple[int, int]:
+        snapshots = _generations(self.directory, "snapshot-", ".bin")
+        gen = snapshots[-1] if snapshots else 0
+        if snapshots:
+            self._load_snapshot(_snapshot_path(self.directory, gen))
+        replayed = 0
+        for wal_gen in _generations(self.directory, "wal-", ".log"):
+            if wal_gen >= gen:
+                replayed += self._replay(_wal_path(self.directory, wal_gen))
+        self._since_snapshot = replayed
+        return max([gen] + _generations(self.directory, "wal-", ".log")), replayed
+
+    def _load_snapshot(self, path: str) -> None:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                magic, version, _, count = SNAPSHOT_HEADER.unpack_from(view, 0)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"{path!r} no es un snapshot de cuentas válido.")
+                pos = SNAPSHOT_HEADER.size
+                self._balances.frombytes(view[pos:pos + 8 * count])
+                owners = str(view[pos + 8 * count:], "utf-8")
+            finally:
+                view.release()
+        self._owners = owners.split("\0") if count else []
+        self._slots = dict(zip(self._owners, range(count)))
+
+    def _replay(self, path: str) -> int:
+        with open(path, "r+b") as f:
+            data = f.read()
+            view = memoryview(data)
+            good, count = 0, 0
+            for good, payload in _frames(view):
+                pos = 0
+                while pos < len(payload):
+                    kind = payload[pos]
+                    if kind == OPEN:
+                        _, slot, balance, size = OPEN_RECORD.unpack_from(payload, pos)
+                        pos += OPEN_RECORD.size
+                        owner = bytes(payload[pos:pos + size]).decode("utf-8")
+                        pos += size
+                        self._add(owner, balance)
+                    else:
+                        _, slot, _, balance = TX_RECORD.unpack_from(payload, pos)
+                        pos += TX_RECORD.size
+                        self._balances[slot] = balance
+                    count += 1
+                payload.release()
+            view.release()
+            if good < len(data):
+                f.truncate(good)   # cola rota: se descarta para seguir agregando detrás de lo válido
+        return count
+
+    # --- Estado ---
+    def _add(self, owner: str, balance: float) -> int:
+        slot = len(self._owners)
+        self._owners.append(owner)
+        self._balances.append(balance)
+        self._slots[owner] = slot
+        return slot
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def __contains__(self, owner: str) -> bool:
+        return owner in self._slots
+
+    def account(self, owner: str):
+        """Objeto de cuenta (account_type) del titular; se crea la primera vez que se pide."""
+        slot = self._slots[owner]
+        with self._lock:
+            account = self._accounts.get(slot)
+            if account is None:
+                # Sin pasar por el setter: el balance ya fue validado al registrarse.
+                account = self.account_type.__new__(self.account_type)
+                setattr(account, self._owner_attr, owner)
+                setattr(account, self._balance_attr, self._balances[slot])
+                self._accounts[slot] = account
+            return account
+
+    def balance(self, owner: str) -> float:
+        return self._balances[self._slots[owner]]
+
+    # --- Operaciones ---
+    def open(self, owner: str, balance: float = 0.0, durable: bool = False):
+        """Da de alta una cuenta y la registra en el WAL. Devuelve la cuenta."""
+        if balance < 0:
+            raise ValueError("El balance no puede ser negativo.")
+        if "\0" in owner:
+            raise ValueError("El titular no puede contener el carácter NUL.")
+        name = owner.encode("utf-8")
+        with self._lock:
+            if owner in self._slots:
+                raise ValueError(f"La cuenta {owner!r} ya existe.")
+            slot = self._add(owner, float(balance))
+            self._buffer += OPEN_RECORD.pack(OPEN, slot, float(balance), len(name))
+            self._buffer += name
+            seq = self._appended()
+        self._after_append(seq, durable)
+        return self.account(owner)
+
+    def deposit(self, owner: str, amount: float, durable: bool = False) -> float:
+        """Deposita y registra en el WAL. Devuelve el balance resultante."""
+        return self._apply(owner, DEPOSIT, amount, durable)
+
+    def withdraw(self, owner: str, amount: float, durable: bool = False) -> float:
+        """Extrae y registra en el WAL. Devuelve el balance resultante."""
+        return self._apply(owner, WITHDRAW, amount, durable)
+
+    def _apply(self, owner: str, kind: int, amount: float, durable: bool) -> float:
+        if not amount > 0:
+            raise ValueError("El monto debe ser > 0.")
+        amount = float(amount)
+        with self._lock:
+            slot = self._slots.get(owner)
+            if slot is None:
+                raise KeyError(owner)
+            balance = self._balances[slot]
+            if kind == WITHDRAW:
+                if amount > balance:
+                    raise ValueError("Fondos insuficientes.")
+                balance -= amount
+            else:
+                balance += amount
+            self._balances[slot] = balance
+            account = self._accounts.get(slot)
+            if account is not None:
+                setattr(account, self._balance_attr, balance)
+                account._version += 1   # invalida los resúmenes de sus préstamos
+            self._buffer += TX_RECORD.pack(kind, slot, amount, balance)
+            seq = self._appended()
+        self._after_append(seq, durable)
+        return balance
+
+    def _appended(self) -> int:
+        self._seq += 1
+        self._pending += 1
+        self._since_snapshot += 1
+        return self._seq
+
+    def _after_append(self, seq: int, durable: bool) -> None:
+        if durable or self._pending >= self.group_size:
+            self.commit(seq)
+        if self.snapshot_every is not None and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    # --- Durabilidad ---
+    def commit(self, upto: Optional[int] = None) -> None:
+        """
+        Group commit: asegura en disco todo lo agregado hasta `upto` (por defecto, todo).
+        Si otro hilo ya hizo el fsync que lo cubre, vuelve sin escribir.
+        """
+        upto = self._seq if upto is None else upto
+        if self._durable >= upto:
+            return
+        with self._io_lock:
+            if self._durable >= upto:
+                return
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        # Requiere _io_lock. Toma el buffer completo: un marco y un fsync para todos.
+        with self._lock:
+            payload, seq = self._take_buffer()
+        self._write_frame(payload, seq)
+
+    def _take_buffer(self) -> Tuple[bytes, int]:
+        # Requiere _lock.
+        payload, seq = bytes(self._buffer), self._seq
+        self._buffer.clear()
+        self._pending = 0
+        return payload, seq
+
+    def _write_frame(self, payload: bytes, seq: int) -> None:
+        # Requiere _io_lock.
+        if payload:
+            self._wal.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)))
+            self._wal.write(payload)
+            self._wal.flush()
+            if self._fsync:
+                os.fsync(self._wal.fileno())
+        self._durable = seq
+
+    def snapshot(self) -> str:
+        """Escribe un snapshot compacto, arranca un WAL nuevo y borra los anteriores. Devuelve la ruta."""
+        with self._io_lock:
+            with self._lock:
+                self._write_frame(*self._take_buffer())
+                gen = self._generation + 1
+                path = _snapshot_path(self.directory, gen)
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(SNAPSHOT_HEADER.pack(MAGIC, VERSION, gen, len(self._balances)))
+                    f.write(self._balances)
+                    f.write("\0".join(self._owners).encode("utf-8"))
+                    f.flush()
+                    if self._fsync:
+                        os.fsync(f.fileno())
+                os.replace(tmp, path)
+                self._wal.close()
+                old = self._generation
+                self._generation = gen
+                self._wal = open(_wal_path(self.directory, gen), "ab")
+                self._since_snapshot = 0
+            for g in _generations(self.directory, "snapshot-", ".bin"):
+                if g < gen:
+                    os.remove(_snapshot_path(self.directory, g))
+            for g in _generations(self.directory, "wal-", ".log"):
+                if g <= old:
+                    os.remove(_wal_path(self.directory, g))
+        return path
+
+    def close(self) -> None:
+        if self._wal.closed:
+            return
+        self.commit()
+        self._wal.close()
+
+    def __enter__(self) -> "AccountStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    rnd = random.Random(11)
+    n_accounts, n_ops = 1_000_000, 200_000
+
+    t0 = perf_counter()
+    with AccountStore(directory, group_size=4096, snapshot_every=None) as store:
+        for n in range(n_accounts):
+            store.open(f"cliente-{n}", 1000.0)
+        store.snapshot()
+        for _ in range(n_ops):
+            owner = f"cliente-{rnd.randrange(n_accounts)}"
+            try:
+                if rnd.random() < 0.5:
+                    store.deposit(owner, rnd.uniform(1, 500))
+                else:
+                    store.withdraw(owner, rnd.uniform(1, 500))
+            except ValueError:
+                pass
+        expected = store.balance("cliente-42")
+    print(f"Carga: {n_accounts:,} cuentas + {n_ops:,} operaciones en {perf_counter() - t0:.2f} s")
+
+    with AccountStore(directory) as restored:
+        print(f"Restauración: {restored.restore_stats}")
+        print(f"cliente-42: {restored.balance('cliente-42'):.2f} (esperado {expected:.2f})")
+
+    with AccountStore(tempfile.mkdtemp(), account_type=CuentaBancaria) as cuentas:
+        cuentas.open("Mauricio", 1500.0)
+        cuentas.deposit("Mauricio", 250.0, durable=True)
+        print(f"CuentaBancaria: {cuentas.account('Mauricio').saldo:.2f}")
@@ -0,0 +1,243 @@
+#Reportes en streaming de préstamos (resúmenes + filas de cronograma) a NDJSON o CSV.
+#Memoria acotada: se procesa un préstamo por vez (su cronograma columnar se formatea
+#de una pasada, con map sobre las columnas) y las líneas se acumulan en un buffer que
+#se vuelca al archivo cada flush_lines líneas. Nada depende del tamaño de la cartera.
+#Con gzip (o ruta *.gz) se comprime al vuelo.
+#
+#Formato (una línea por registro, en ambos formatos):
+#  {"record": "row", "loan": 0, "period": 1, "payment": ..., ...}      (filas del préstamo)
+#  {"record": "summary", "loan": 0, "type": "FrenchLoan", ...}         (luego, su resumen)
+#En CSV hay una sola cabecera con la unión de columnas; las que no aplican quedan vacías.
+
+from __future__ import annotations
+import csv
+import gzip as gzip_module
+import io
+import json
+from dataclasses import dataclass
+from itertools import repeat
+from time import perf_counter
+from typing import Callable, Iterable, List, Mapping, Optional, TextIO, Tuple, Union
+
+from ejercicio_1 import COLUMNS, Loan, Schedule
+
+SUMMARY_FIELDS = ("type", "strategy", "approved_principal", "periods", "interest_rate", "total_paid", "total_interest")
+CSV_HEADER = ("record", "loan") + SUMMARY_FIELDS + COLUMNS
+FORMATS = ("ndjson", "csv")
+
+# Las filas son sólo números: se arman con formato fijo en vez de json.dumps (repr de float es JSON válido).
+_NDJSON_ROW = '"period":{},"payment":{!r},"interest":{!r},"amortization":{!r},"remaining":{!r}}}\n'
+
+
+@dataclass
+class ReportStats:
+    """Progreso del reporte (se actualiza en cada volcado y al cerrar)."""
+    loans: int = 0
+    rows: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class ReportWriter:
+    """
+    Escritor de reportes. Usar como context manager.
+    target: ruta (se abre y se cierra acá) o un stream de texto ya abierto (p. ej. sys.stdout).
+    format: "ndjson" o "csv" (por defecto, según la extensión; si no, ndjson).
+    gzip: comprimir (por defecto, si la ruta termina en .gz).
+    flush_lines: líneas acumuladas en memoria antes de escribir (cota de memoria del buffer).
+    progress: callback opcional que recibe ReportStats en cada volcado.
+    """
+
+    def __init__(self, target: Union[str, TextIO], format: Optional[str] = None, gzip: Optional[bool] = None,
+                 flush_lines: int = 8192, progress: Optional[Callable[[ReportStats], None]] = None) -> None:
+        if flush_lines <= 0:
+            raise ValueError("flush_lines debe ser un entero positivo.")
+        name = target if isinstance(target, str) else ""
+        plain = name[:-3] if name.endswith(".gz") else name
+        self.format = format or ("csv" if plain.endswith(".csv") else "ndjson")
+        if self.format not in FORMATS:
+            raise ValueError(f"Formato desconocido: {self.format!r}. Use uno de: {', '.join(FORMATS)}")
+        compress = name.endswith(".gz") if gzip is None else gzip
+
+        if isinstance(target, str):
+            if compress:
+                self._stream = gzip_module.open(target, "wt", encoding="utf-8", newline="")
+            else:
+                self._stream = open(target, "w", encoding="utf-8", newline="")
+            self._owns_stream = True
+        else:
+            if compress:
+                raise ValueError("gzip sólo se puede usar cuando target es una ruta.")
+            self._stream = target
+            self._owns_stream = False
+
+        self.flush_lines = flush_lines
+        self.progress = progress
+        self.stats = ReportStats()
+        self._lines: List[str] = []
+        self._csv = csv.writer(self, lineterminator="\n") if self.format == "csv" else None
+        self._next_id = 0
+        self._t0 = perf_counter()
+        if self._csv is not None:
+            self._csv.writerow(CSV_HEADER)
+
+    # csv.writer escribe acá: la línea queda en el buffer como cualquier otra.
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= self.flush_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        """Vuelca el buffer al stream y actualiza stats (y progress, si hay)."""
+        if self._lines:
+            self._stream.write("".join(self._lines))
+            self._lines.clear()
+        self.stats.seconds = perf_counter() - self._t0
+        if self.progress is not None:
+            self.progress(self.stats)
+
+    # --- Registros ---
+    def _rows(self, loan_id: object, schedule: Iterable) -> None:
+        """
+        Filas de un cronograma: de un Schedule se toman las columnas sin armar filas;
+        de otro (lista de dicts del contrato anterior, filas sueltas) se leen por nombre.
+        """
+        if isinstance(schedule, Schedule):
+            cols = [schedule.column(c) for c in COLUMNS]
+        else:
+            rows = list(schedule)
+            cols = [[row[c] for row in rows] for c in COLUMNS]
+        if self._csv is None:
+            template = '{{"record":"row","loan":' + json.dumps(loan_id).replace("{", "{{").replace("}", "}}") + "," + _NDJSON_ROW
+            self._lines.extend(map(template.format, *cols))
+        else:
+            self._csv.writerows(zip(repeat("row"), repeat(loan_id), *repeat(repeat(""), len(SUMMARY_FIELDS)), *cols))
+        self.stats.rows += len(cols[0])
+        if len(self._lines) >= self.flush_lines:
+            self.flush()
+
+    def _summary(self, loan_id: object, info: Mapping) -> None:
+        if self._csv is None:
+            record = {"record": "summary", "loan": loan_id}
+            record.update((field, info[field]) for field in SUMMARY_FIELDS)
+            self.write(json.dumps(record, separators=(",", ":")) + "\n")
+        else:
+            self._csv.writerow(("summary", loan_id) + tuple(info[f] for f in SUMMARY_FIELDS) + ("",) * len(COLUMNS))
+        self.stats.loans += 1
+
+    def _loan_id(self, loan_id: object) -> object:
+        if loan_id is None:
+            loan_id = self._next_id
+            self._next_id += 1
+        return loan_id
+
+    def write_loan(self, loan: Loan, requested_principal: float, loan_id: object = None,
+                   include_rows: bool = True) -> Mapping:
+        """
+        Escribe las filas (si include_rows) y el resumen de un préstamo.
+        Devuelve el resumen (sin cronograma). ValueError si no es financiable.
+        """
+        loan_id = self._loan_id(loan_id)
+        info = loan.summary(requested_principal, include_schedule=False)
+        if include_rows:
+            self._rows(loan_id, loan.build_schedule(requested_principal))
+        self._summary(loan_id, info)
+        return info
+
+    def write_summary(self, info: Mapping, loan_id: object = None) -> None:
+        """
+        Escribe un resumen ya calculado (y sus filas, si trae "schedule", en cualquier formato):
+
+        >>> from ejercicio_1 import BankAccount, LoanFactory
+        >>> info = LoanFactory.create("francés", BankAccount("Ana", 1500.0), 0.03, 2).summary(1_000.0)
+        >>> info["schedule"] = info["schedule"].to_dicts()
+        >>> buffer = io.StringIO()
+        >>> with ReportWriter(buffer) as writer:
+        ...     writer.write_summary(info)
+        >>> records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+        >>> [(r["record"], r.get("period")) for r in records], records[0]["interest"]
+        ([('row', 1), ('row', 2), ('summary', None)], 30.0)
+        """
+        loan_id = self._loan_id(loan_id)
+        if "schedule" in info:
+            self._rows(loan_id, info["schedule"])
+        self._summary(loan_id, info)
+
+    def close(self) -> None:
+        if self._stream is None:
+            return
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+        self._stream = None
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def write_report(target: Union[str, TextIO], loans: Iterable[Tuple[Loan, float]], format: Optional[str] = None,
+                 gzip: Optional[bool] = None, include_rows: bool = True, skip_errors: bool = False,
+                 flush_lines: int = 8192, progress: Optional[Callable[[ReportStats], None]] = None) -> ReportStats:
+    """
+    Reporte completo de una cartera dada como iterable de (loan, capital pedido).
+    Con un generador como entrada, la memoria no depende del tamaño de la cartera.
+    skip_errors=True saltea (y cuenta en stats.skipped) los préstamos no financiables.
+    """
+    with ReportWriter(target, format, gzip, flush_lines, progress) as writer:
+        for loan, requested in loans:
+            try:
+                writer.write_loan(loan, requested, include_rows=include_rows)
+            except ValueError:
+                if not skip_errors:
+                    raise
+                writer.stats.skipped += 1
+    return writer.stats
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import tracemalloc
+
+    from ejercicio_1 import BankAccount, LoanFactory
+
+    def book(size: int):
+        rnd = random.Random(5)
+        for n in range(size):
+            cuenta = BankAccount(f"cliente-{n}", rnd.uniform(0, 20_000))
+            loan = LoanFactory.create(rnd.choice(("alemán", "americano", "francés")), cuenta,
+                                      rnd.choice((0.01, 0.02, 0.03)), rnd.choice((12, 36, 120)))
+            yield loan, rnd.uniform(1_000, 50_000)
+
+    directory = tempfile.mkdtemp()
+    for name in ("reporte.ndjson", "reporte.csv.gz"):
+        path = os.path.join(directory, name)
+        stats = write_report(path, book(5_000), skip_errors=True)
+        print(f"{name}: {stats.loans} préstamos, {stats.rows:,} filas, {stats.skipped} salteados, "
+              f"{stats.rows_per_sec:,.0f} filas/s, {os.path.getsize(path):,} bytes")
+
+    # El pico de memoria no crece con la cartera
+    for size in (1_000, 10_000):
+        tracemalloc.start()
+        write_report(os.path.join(directory, "pico.ndjson"), book(size), skip_errors=True)
+        print(f"Pico de memoria con {size:,} préstamos: {tracemalloc.get_traced_memory()[1] / 1024:,.0f} KiB")
+        tracemalloc.stop()
+
+    buffer = io.StringIO()
+    with ReportWriter(buffer) as preview:
+        preview.write_loan(LoanFactory.create("francés", BankAccount("Mauricio", 1500.0), 0.03, 2), 1_000.0)
+    print(buffer.getvalue(), end="")
@@ -0,0 +1,264 @@
+#Simulación Monte Carlo de prepagos y defaults sobre una cartera.
+#Cada préstamo sigue su cronograma (RepaymentStrategy) hasta el primer evento:
+#  - prepago en t: paga la cuota t y cancela el saldo restante,
+#  - default en t: no paga la cuota t y se recupera `recovery` del saldo adeudado,
+#  - sin evento: llega al vencimiento.
+#Un camino queda determinado por (período del evento, tipo de evento), así que no
+#hace falta recorrer caminos x períodos: el período se sortea con la curva de
+#supervivencia (bisect) y los flujos salen de sumas acumuladas del cronograma,
+#calculadas una vez por producto. Cada camino cuesta O(log n).
+#Sólo se guardan los totales de la cartera por camino (un array por métrica);
+#los cuantiles se publican después de cada bloque de préstamos.
+#Reproducible: cada préstamo usa su propio generador, sembrado con (seed, índice).
+
+from __future__ import annotations
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ejercicio_1 import BankAccount, LoanFactory, RepaymentStrategy
+from ejercicio_1_cartera import INVALID_BALANCE, UNKNOWN_KIND, approve_batch
+
+Curve = Union[float, Sequence[float]]
+METRICS = ("cash", "npv", "loss")
+QUANTILES = (0.01, 0.05, 0.5, 0.95, 0.99)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Probabilidades condicionales por período (un número, o una curva por período;
+    si la curva es más corta que el plazo se repite su último valor).
+    discount_rate=None descuenta cada préstamo a su propia tasa.
+    """
+    prepayment: Curve = 0.01
+    default: Curve = 0.002
+    recovery: float = 0.4
+    discount_rate: Optional[float] = None
+
+    def hazards(self, periods: int) -> Tuple[List[float], List[float]]:
+        prepay, default = _curve(self.prepayment, periods), _curve(self.default, periods)
+        for t, (p, d) in enumerate(zip(prepay, default), start=1):
+            if p < 0 or d < 0 or p + d > 1:
+                raise ValueError(f"Probabilidades inválidas en el período {t}: prepago={p}, default={d}.")
+        return prepay, default
+
+
+def _curve(value: Curve, periods: int) -> List[float]:
+    if isinstance(value, (int, float)):
+        return [float(value)] * periods
+    values = [float(v) for v in value[:periods]]
+    if not values:
+        raise ValueError("Una curva de probabilidades no puede estar vacía.")
+    return values + [values[-1]] * (periods - len(values))
+
+
+@dataclass
+class SimulationSnapshot:
+    """Estado agregado de la simulación después de cada bloque."""
+    loans_done: int
+    loans_total: int
+    paths: int
+    seconds: float
+    mean: Dict[str, float]
+    quantiles: Dict[str, Dict[float, float]]
+    events: Dict[str, int] = field(default_factory=dict)   # préstamo-camino por desenlace
+    reason_counts: Dict[str, int] = field(default_factory=dict)   # decisión de approve_batch por motivo
+
+
+class _Product:
+    """Sumas acumuladas de un cronograma con capital 1 (los flujos escalan con el capital)."""
+    __slots__ = ("cash", "disc", "balance", "discount", "survival", "prepay_share")
+
+    def __init__(self, strategy: RepaymentStrategy, rate: float, periods: int, scenario: Scenario) -> None:
+        cols = strategy.build_columns(1.0, rate, periods)
+        v = 1.0 / (1.0 + (rate if scenario.discount_rate is None else scenario.discount_rate))
+        self.cash = array("d", [0.0])            # cash[t]: pagos de los períodos 1..t
+        self.disc = array("d", [0.0])            # disc[t]: ídem, descontados
+        self.balance = array("d", [1.0])         # balance[t]: saldo luego del período t
+        self.discount = array("d", [1.0])        # discount[t] = v^t
+        vt = 1.0
+        for payment, remaining in zip(cols["payment"], cols["remaining"]):
+            vt *= v
+            self.cash.append(self.cash[-1] + payment)
+            self.disc.append(self.disc[-1] + payment * vt)
+            self.balance.append(remaining)
+            self.discount.append(vt)
+        # Supervivencia negada (creciente) para sortear el período con bisect,
+        # y qué parte del riesgo de cada período es prepago.
+        prepay, default = scenario.hazards(periods)
+        alive, self.survival, self.prepay_share = 1.0, array("d"), array("d")
+        for p, d in zip(prepay, default):
+            alive *= 1.0 - (p + d)
+            self.survival.append(-alive)
+            self.prepay_share.append(p / (p + d) if p + d > 0 else 0.0)
+
+
+def _simulate_chunk(loans: Sequence[Tuple[int, RepaymentStrategy, float, float, int]], scenario: Scenario,
+                    paths: int, seed: int) -> Tuple[Dict[str, array], Dict[str, int]]:
+    """
+    Suma por camino los flujos de un bloque de préstamos (índice, estrategia, capital, tasa, plazo).
+    Devuelve {métrica: array de largo paths} y la cuenta de desenlaces.
+    """
+    totals = {m: array("d", bytes(8 * paths)) for m in METRICS}
+    cash_total, npv_total, loss_total = totals["cash"], totals["npv"], totals["loss"]
+    events = {"matured": 0, "prepaid": 0, "defaulted": 0}
+    products: Dict[Tuple[RepaymentStrategy, float, int], _Product] = {}
+    recovery = scenario.recovery
+
+    for idx, strategy, principal, rate, periods in loans:
+        key = (strategy, rate, periods)
+        product = products.get(key)
+        if product is None:
+            product = products[key] = _Product(strategy, rate, periods, scenario)
+        cash, disc, balance, discount = product.cash, product.disc, product.balance, product.discount
+        survival, prepay_share = product.survival, product.prepay_share
+        rnd = random.Random(f"{seed}:{idx}")
+        draw = rnd.random
+        matured = prepaid = 0
+        for k in range(paths):
+            t = bisect_right(survival, -draw()) + 1   # período del evento (periods + 1 = ninguno)
+            if t > periods:
+                c, v, l = cash[periods], disc[periods], 0.0
+                matured += 1
+            elif draw() < prepay_share[t - 1]:
+                c = cash[t] + balance[t]
+                v = disc[t] + balance[t] * discount[t]
+                l = 0.0
+                prepaid += 1
+            else:
+                owed = balance[t - 1]
+                c = cash[t - 1] + recovery * owed
+                v = disc[t - 1] + recovery * owed * discount[t]
+                l = (1.0 - recovery) * owed
+            cash_total[k] += principal * c
+            npv_total[k] += principal * v
+            loss_total[k] += principal * l
+        events["matured"] += matured
+        events["prepaid"] += prepaid
+        events["defaulted"] += paths - matured - prepaid
+    return totals, events
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def simulate_book(kinds: Sequence[str], balances: Sequence[float], rates: Sequence[float],
+                  periods: Sequence[int], requested: Sequence[float], scenario: Scenario = Scenario(),
+                  paths: int = 1_000, seed: int = 0, chunk_size: int = 500,
+                  max_workers: Optional[int] = 1, quantiles: Sequence[float] = QUANTILES
+                  ) -> Iterator[SimulationSnapshot]:
+    """
+    Simula `paths` escenarios de toda la cartera (sólo los préstamos aprobados por
+    approve_batch, con su capital aprobado). Genera un SimulationSnapshot después de
+    cada bloque de chunk_size préstamos; el último tiene el resultado completo.
+    Una etiqueta desconocida o un balance inválido son errores de datos (ValueError,
+    como una tasa fuera de rango); los rechazos de negocio quedan en reason_counts.
+
+    >>> snap = run_book(["francés", "alemán"], [1_000.0, 0.0], [0.02, 0.02], [12, 12], [500.0, 500.0], paths=10)
+    >>> snap.loans_total, snap.reason_counts
+    (1, {'approved': 1, 'no_capacity': 1})
+    >>> run_book(["frances", "francez"], [1_000.0, 1_000.0], [0.02, 0.02], [12, 12], [500.0, 500.0])
+    Traceback (most recent call last):
+    ...
+    ValueError: Tipo de crédito desconocido en el préstamo 1: 'francez'.
+
+    Métricas por camino, sumadas sobre la cartera: cash (cobrado nominal), npv (cobrado
+    descontado) y loss (pérdida por default). Con la misma seed y chunk_size el
+    resultado es idéntico, con cualquier max_workers (los bloques se suman en orden).
+    """
+    if paths <= 0 or chunk_size <= 0:
+        raise ValueError("paths y chunk_size deben ser enteros positivos.")
+    if not (0.0 <= scenario.recovery <= 1.0):
+        raise ValueError("recovery debe estar en [0, 1].")
+    for idx in range(len(kinds)):
+        if not (0.0 <= rates[idx] < 1.0):
+            raise ValueError(f"interest_rate fuera de [0, 1) en el préstamo {idx}.")
+        if periods[idx] <= 0:
+            raise ValueError(f"periods debe ser positivo en el préstamo {idx}.")
+
+    decision = approve_batch(balances, requested, kinds)
+    for idx, code in enumerate(decision["reason"]):
+        if code == UNKNOWN_KIND:
+            raise ValueError(f"Tipo de crédito desconocido en el préstamo {idx}: {kinds[idx]!r}.")
+        if code == INVALID_BALANCE:
+            raise ValueError(f"balance inválido en el préstamo {idx}.")
+    approved = decision["approved_principal"]
+    accepted = [j for j in range(len(kinds)) if approved[j] > 0]
+    # La estrategia de un préstamo prototipo: también vale para clases registradas con su propio __init__.
+    strategy_of = {kind: LoanFactory.create(kind, BankAccount("simulación"), 0.0, 1).strategy
+                   for kind in {kinds[j] for j in accepted}}
+    book = [(j, strategy_of[kinds[j]], approved[j], float(rates[j]), int(periods[j])) for j in accepted]
+    chunks = [book[start:start + chunk_size] for start in range(0, len(book), chunk_size)]
+
+    t0 = perf_counter()
+    totals = {m: array("d", bytes(8 * paths)) for m in METRICS}
+    events = {"matured": 0, "prepaid": 0, "defaulted": 0}
+    pool = None
+    if max_workers == 1 or len(chunks) <= 1:
+        partials = (_simulate_chunk(chunk, scenario, paths, seed) for chunk in chunks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        partials = pool.map(_simulate_chunk, chunks, [scenario] * len(chunks),
+                            [paths] * len(chunks), [seed] * len(chunks))
+    try:
+        done = 0
+        for chunk, (partial, partial_events) in zip(chunks, partials):
+            for m in METRICS:
+                acc, col = totals[m], partial[m]
+                for k in range(paths):
+                    acc[k] += col[k]
+            for name, count in partial_events.items():
+                events[name] += count
+            done += len(chunk)
+            ordered = {m: sorted(totals[m]) for m in METRICS}
+            yield SimulationSnapshot(
+                loans_done=done,
+                loans_total=len(book),
+                paths=paths,
+                seconds=perf_counter() - t0,
+                mean={m: sum(totals[m]) / paths for m in METRICS},
+                quantiles={m: {q: _quantile(ordered[m], q) for q in quantiles} for m in METRICS},
+                events=dict(events),
+                reason_counts=dict(decision["reason_counts"]),
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def run_book(*args, **kwargs) -> SimulationSnapshot:
+    """Atajo: corre simulate_book hasta el final y devuelve el último snapshot."""
+    last = None
+    for last in simulate_book(*args, **kwargs):
+        pass
+    if last is None:
+        raise ValueError("La cartera no tiene préstamos aprobados para simular.")
+    return last
+
+
+# ======================================
+# Ejemplo de uso (demo rápida/manual)
+# ======================================
+if __name__ == "__main__":
+    rnd = random.Random(9)
+    size = 2_000
+    kinds = [rnd.choice(("alemán", "americano", "francés")) for _ in range(size)]
+    balances = [rnd.uniform(0, 20_000) for _ in range(size)]
+    rates = [rnd.choice((0.01, 0.02, 0.03)) for _ in range(size)]
+    periods = [rnd.choice((12, 24, 36, 120)) for _ in range(size)]
+    requested = [rnd.uniform(1_000, 50_000) for _ in range(size)]
+
+    # Prepago que crece los primeros 12 meses; default constante
+    scenario = Scenario(prepayment=[0.002 * t for t in range(1, 13)], default=0.003, recovery=0.35)
+    for snap in simulate_book(kinds, balances, rates, periods, requested, scenario,
+                              paths=1_000, seed=42, chunk_size=500, max_workers=None):
+        print(f"{snap.loans_done:>5}/{snap.loans_total} préstamos en {snap.seconds:.2f} s | "
+              f"pérdida p50={snap.quantiles['loss'][0.5]:,.0f} p99={snap.quantiles['loss'][0.99]:,.0f} | "
+              f"VAN p1={snap.quantiles['npv'][0.01]:,.0f}")
+    print(f"Desenlaces: {snap.events}")